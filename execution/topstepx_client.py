@@ -1,18 +1,583 @@
 """
 TopstepX API Client
 
-Handles authentication and REST API calls. SignalR for real-time to be added later.
+Handles authentication and REST API calls. Account positions, orders and trades can
+also be streamed from the SignalR User Hub (see ``connect_streams``).
+Read-heavy endpoints also have ``a``-prefixed async variants backed by ``httpx`` so
+callers can fan out many history/search requests concurrently.
+
+``pyarrow``, ``httpx`` and ``ijson`` are imported on first use (bar cache, async calls,
+large-response streaming) so importing the client stays cheap for callers that only
+need the REST basics.
 """
 
+import asyncio
+import hashlib
+import io
 import os
-import json
-from datetime import datetime, timezone
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, wraps
+from operator import itemgetter
+from pathlib import Path
+from types import MappingProxyType
 
+import numpy as np
+import orjson
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.utils import atomic_write_bytes
 
 load_dotenv()
 
+# Transient gateway errors and rate limiting are retried with backoff, honouring Retry-After.
+_READ_RETRY = Retry(
+    total=5,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["GET", "POST"]),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+# Order mutations are not idempotent: only retry when the request was never processed.
+_ORDER_RETRY = Retry(
+    total=3,
+    read=0,
+    backoff_factor=0.3,
+    status_forcelist=(429,),
+    allowed_methods=frozenset(["POST"]),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+
+_UTC = timezone.utc
+
+_UNIT_MAP = MappingProxyType({
+    "second": 1,
+    "seconds": 1,
+    "sec": 1,
+    "s": 1,
+    "minute": 2,
+    "minutes": 2,
+    "min": 2,
+    "m": 2,
+    "hour": 3,
+    "hours": 3,
+    "h": 3,
+    "day": 4,
+    "days": 4,
+    "d": 4,
+    "week": 5,
+    "weeks": 5,
+    "w": 5,
+    "month": 6,
+    "months": 6,
+    "mo": 6,
+})
+
+# Bar lengths in seconds for the gateway's fixed-length units; weeks and months are absent.
+_UNIT_SECONDS = MappingProxyType({1: 1, 2: 60, 3: 3600, 4: 86400})
+
+# retrieveBars never returns more than this many bars, whatever ``limit`` asks for.
+_MAX_BARS = 20_000
+
+# A closed day is cached only once it has been over for this long, so late bars can land.
+_BAR_SETTLE = timedelta(hours=1)
+
+
+def _to_iso8601(value):
+    if isinstance(value, str):
+        return value
+    if not isinstance(value, datetime):
+        raise TypeError("start_time/end_time must be datetime or ISO string")
+    return _format_utc(value)
+
+
+@lru_cache(maxsize=256)
+def _format_utc(value):
+    # Batched pulls reuse the same window bounds across contracts/timeframes.
+    if value.tzinfo is not None and value.utcoffset():
+        value = value.astimezone(_UTC)
+    # Format the UTC fields directly; avoids isoformat() plus a "+00:00" -> "Z" replace.
+    return (
+        f"{value.year:04d}-{value.month:02d}-{value.day:02d}"
+        f"T{value.hour:02d}:{value.minute:02d}:{value.second:02d}Z"
+    )
+
+
+def _parse_time(value):
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    # Gateway timestamps carry "+00:00"/"Z", which fromisoformat maps to the UTC singleton.
+    if parsed.tzinfo is _UTC:
+        return parsed
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _as_utc(value):
+    """Return ``value`` (datetime or ISO string) as an aware UTC datetime, or ``None``."""
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    return _parse_time(value)
+
+
+_BAR_DTYPE = np.dtype(
+    [("t", "datetime64[ns]"), ("o", "f8"), ("h", "f8"), ("l", "f8"), ("c", "f8"), ("v", "i8")]
+)
+
+
+def _times_to_datetime64(times):
+    """Parse ISO timestamps into naive-UTC ``datetime64[ns]`` values.
+
+    Canonical UTC strings (``...+00:00`` / ``...Z``) have the suffix dropped and are parsed
+    by NumPy in C; converting datetime objects element by element is ~15x slower, so that
+    path is only taken when a response mixes offsets or contains unparseable values.
+    """
+    try:
+        naive = [t[:-6] if t.endswith("+00:00") else t[:-1] if t.endswith("Z") else None for t in times]
+        if None not in naive:
+            return np.array(naive, dtype="datetime64[ns]")
+    except (AttributeError, ValueError):
+        pass
+    parsed = (_parse_time(value) for value in times)
+    return np.array([ts.replace(tzinfo=None) if ts else None for ts in parsed], dtype="datetime64[ns]")
+
+
+def _to_datetime64(value):
+    """Convert an aware datetime to the naive-UTC ``datetime64[ns]`` used by bar arrays."""
+    return np.datetime64(value.astimezone(_UTC).replace(tzinfo=None), "ns")
+
+
+_BAR_FIELDS = itemgetter("t", "o", "h", "l", "c", "v")
+
+
+def _bars_to_array(bars):
+    """Convert gateway bar dicts into one structured array (naive UTC timestamps).
+
+    Prices stay float64: float32 cannot hold tick-accurate prices for high-priced
+    contracts once P&L is accumulated from them.
+    """
+    try:
+        rows = [_BAR_FIELDS(bar) for bar in bars]
+    except KeyError:  # a bar missing a field; fall back to per-key defaults
+        rows = [(bar.get("t"), bar.get("o"), bar.get("h"), bar.get("l"), bar.get("c"), bar.get("v")) for bar in bars]
+    array = np.empty(len(rows), dtype=_BAR_DTYPE)
+    if not rows:
+        return array
+
+    times, opens, highs, lows, closes, volumes = zip(*rows)
+    array["t"] = _times_to_datetime64(times)
+    # None prices become NaN through the float64 conversion.
+    array["o"] = np.array(opens, dtype="f8")
+    array["h"] = np.array(highs, dtype="f8")
+    array["l"] = np.array(lows, dtype="f8")
+    array["c"] = np.array(closes, dtype="f8")
+    array["v"] = np.array([volume or 0 for volume in volumes], dtype="i8")
+    return array
+
+
+# Bodies above these sizes are parsed incrementally; orjson's bulk parse wins below them.
+_STREAM_PARSE_BYTES = 1 << 20
+_STREAM_SEARCH_BYTES = 256 << 10
+_SCALAR_EVENTS = frozenset(["null", "boolean", "integer", "double", "number", "string"])
+
+
+def _stream_json(raw, collection):
+    """Parse a gateway body from a file-like object without buffering it whole.
+
+    Items of the top-level ``collection`` array (``bars``, ``orders``, ...) are built one
+    at a time; top-level scalars (``success``, ``errorCode``, ...) are kept so the result
+    has the same shape as ``orjson.loads`` would give. Malformed input raises
+    ``ValueError``, the base class of ``orjson.JSONDecodeError``.
+    """
+    import ijson
+
+    items = []
+    data = {collection: items}
+    item_prefix = f"{collection}.item"
+    builder = None
+    try:
+        for prefix, event, value in ijson.parse(raw, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == item_prefix and event == "end_map":
+                    items.append(builder.value)
+                    builder = None
+            elif prefix == item_prefix and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif prefix and "." not in prefix and event in _SCALAR_EVENTS:
+                data[prefix] = value
+    except ijson.JSONError as exc:
+        raise ValueError(f"Invalid JSON body: {exc}") from exc
+    return data
+
+
+def _decode_json(response, collection, threshold):
+    """Decode a ``stream=True`` response, streaming ``collection`` when the body exceeds ``threshold``."""
+    if int(response.headers.get("Content-Length") or 0) > threshold:
+        response.raw.decode_content = True
+        return _stream_json(response.raw, collection)
+    return orjson.loads(response.content)
+
+
+def _canonical_bar(bar):
+    """Return ``bar`` with the cache's types: float prices and an int volume (``None`` kept)."""
+    o, h, l, c, v = bar.get("o"), bar.get("h"), bar.get("l"), bar.get("c"), bar.get("v")
+    return {
+        "t": bar.get("t"),
+        "o": None if o is None else float(o),
+        "h": None if h is None else float(h),
+        "l": None if l is None else float(l),
+        "c": None if c is None else float(c),
+        "v": None if v is None else int(v),
+    }
+
+
+@lru_cache(maxsize=None)
+def _bar_schema():
+    import pyarrow as pa
+
+    return pa.schema(
+        [("t", pa.string()), ("o", pa.float64()), ("h", pa.float64()),
+         ("l", pa.float64()), ("c", pa.float64()), ("v", pa.int64())]
+    )
+
+
+def _day_start(day):
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+class BarCache:
+    """On-disk Parquet cache of closed UTC days of bars.
+
+    Files live at ``root/{live|sim}/{contract}/{unit}_{unitNumber}/{yyyy-mm-dd}.parquet``
+    and always hold a complete day, so any window that starts inside cached history can
+    be served from disk and only the remaining tail is fetched from the gateway.
+    Only series whose bars tile a UTC day are cached: a week bar, a multi-day bar or an
+    intraday bar crossing midnight would still be open when its start day closes.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    @staticmethod
+    def cacheable(payload):
+        """True when the payload's bar length is at most a day and divides 24h evenly."""
+        period = _UNIT_SECONDS.get(payload["unit"], 0) * payload["unitNumber"]
+        return 0 < period <= 86400 and 86400 % period == 0
+
+    def _day_path(self, payload, day):
+        feed = "live" if payload["live"] else "sim"
+        series = f"{payload['unit']}_{payload['unitNumber']}"
+        return self.root / feed / str(payload["contractId"]) / series / f"{day.isoformat()}.parquet"
+
+    def split(self, payload):
+        """Return ``(cached_bars, fetch_payload)`` for a retrieveBars payload.
+
+        ``cached_bars`` covers the leading closed days found on disk; ``fetch_payload`` is
+        the payload for the remaining window, or ``None`` when the cache covers it all.
+        """
+        start = _parse_time(payload["startTime"])
+        end = _parse_time(payload["endTime"])
+        if start is None or end is None or start >= end or not self.cacheable(payload):
+            return [], payload
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        now = datetime.now(timezone.utc)
+        day = start.date()
+        cached = []
+        while _day_start(day) <= end and _day_start(day) + timedelta(days=1) <= now:
+            path = self._day_path(payload, day)
+            if not path.exists():
+                break
+            try:
+                cached.extend(pq.read_table(path).to_pylist())
+            except (OSError, pa.ArrowException):
+                break
+            day += timedelta(days=1)
+
+        if not cached:
+            return [], payload
+
+        times = _times_to_datetime64([bar.get("t") for bar in cached])
+        keep = (times >= _to_datetime64(start)) & (times <= _to_datetime64(end))
+        cached = [bar for bar, inside in zip(cached, keep.tolist()) if inside]
+        resume = _day_start(day)
+        if resume > end:
+            return cached, None
+        return cached, {**payload, "startTime": _to_iso8601(max(start, resume))}
+
+    def store(self, payload, data):
+        """Persist the closed days a successful, untruncated response actually covers.
+
+        Only days from the first bar's day through the last bar's day are written: an
+        empty response, or the stretch after the feed stops, may just not have the data
+        yet (main.py falls back from sim to live for this), so those days are asked for
+        again. The last day must also have been over for ``_BAR_SETTLE``.
+        """
+        bars = data.get("bars") or []
+        if not bars or not data.get("success", False) or len(bars) >= min(payload["limit"], _MAX_BARS):
+            return
+        if not self.cacheable(payload):
+            return
+        start = _parse_time(payload["startTime"])
+        end = _parse_time(payload["endTime"])
+        if start is None or end is None:
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        times = _times_to_datetime64([bar.get("t") for bar in bars])
+        by_day = {}
+        # Day buckets come from integer datetime64 truncation; NaT converts to None and is skipped.
+        for bar, bar_day in zip(bars, times.astype("datetime64[D]").tolist()):
+            if bar_day is not None:
+                by_day.setdefault(bar_day, []).append(bar)
+        if not by_day:
+            return
+
+        day = start.date() if start == _day_start(start.date()) else start.date() + timedelta(days=1)
+        day = max(day, min(by_day))
+        last = max(by_day)
+        closed_by = min(end, datetime.now(timezone.utc) - _BAR_SETTLE)
+        while day <= last and _day_start(day) + timedelta(days=1) <= closed_by:
+            path = self._day_path(payload, day)
+            rows = [_canonical_bar(bar) for bar in by_day.get(day, [])]
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                sink = pa.BufferOutputStream()
+                pq.write_table(pa.Table.from_pylist(rows, schema=_bar_schema()), sink, compression="zstd")
+                # Atomic, so coalesced callers storing the same day never expose a partial file.
+                atomic_write_bytes(path, sink.getvalue().to_pybytes())
+            except (OSError, pa.ArrowException) as exc:
+                print(f"Bar cache write failed for {path}: {exc}")
+                return
+            day += timedelta(days=1)
+
+    @staticmethod
+    def merge(payload, cached, data, as_array=False):
+        """Combine cached bars with a fetched response, oldest first, capped at ``limit``.
+
+        Applied whether or not anything was cached, so callers always get the same ordering
+        and bar types (float prices, int volume) regardless of what is on disk. With
+        ``as_array`` the bars are returned as ``bars_array`` in place of the ``bars`` list.
+        """
+        bars = {bar["t"]: bar for bar in cached}
+        for bar in data.get("bars") or []:
+            bars[bar.get("t")] = bar
+        bars = list(bars.values())
+
+        # Cached days and gateway pages are each already ordered (oldest- or newest-first),
+        # so a monotonic check usually replaces the sort; NaT (int64 min) orders first.
+        ticks = _times_to_datetime64([bar.get("t") for bar in bars]).view("i8")
+        steps = np.diff(ticks)
+        limit = payload["limit"]
+        if (steps >= 0).all():
+            ordered = bars[-limit:]
+        elif (steps <= 0).all():
+            ordered = bars[limit - 1::-1] if len(bars) > limit else bars[::-1]
+        else:
+            ordered = [bars[i] for i in np.argsort(ticks, kind="stable")[-limit:]]
+        if as_array:
+            merged = {key: value for key, value in data.items() if key != "bars"}
+            merged["bars_array"] = _bars_to_array(ordered)
+            return merged
+        return {**data, "bars": [_canonical_bar(bar) for bar in ordered]}
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second.
+
+    Each acquire reserves a token up front and computes the exact wait until it is
+    available, so callers are paced below the gateway limits instead of tripping 429s.
+    A non-positive rate disables throttling. ``clock`` is injectable for tests.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self):
+        """Take one token and return how many seconds the caller must wait for it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a token is available."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        """Async variant of :meth:`acquire`."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, seconds):
+        """Hold back all requests for ``seconds``, e.g. from a Retry-After header."""
+        if self.rate <= 0 or seconds <= 0:
+            return
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# Hot endpoints sent from pre-built request templates (see ``_prepared_request``).
+_PREPARED_PATHS = frozenset(["/api/History/retrieveBars", "/api/Order/search"])
+
+_AUTH_PATH = "/api/Auth/loginKey"
+
+# Order placement and cancellation draw from their own slice of TOPSTEPX_RPS so a bar
+# backfill that drains the read bucket cannot delay them; the two rates sum to the limit.
+_ORDER_PATHS = frozenset(["/api/Order/place", "/api/Order/cancel"])
+_ORDER_RATE_SHARE = 0.25
+
+
+def _retry_after_seconds(response):
+    try:
+        return float(response.headers.get('Retry-After', 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class UserStreamCache:
+    """In-memory view of account positions, orders and trades fed by the User Hub.
+
+    Positions are seeded from REST and then kept current by ``GatewayUserPosition``
+    events; a seed older than ``ttl`` seconds is reported stale so callers re-seed.
+    Orders and trades are only known from the moment their subscription started, so
+    they can answer searches whose window begins at or after that point. They are
+    stored as ``(created_at, record)`` so searches never re-parse timestamps.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = float(ttl)
+        self._lock = threading.Lock()
+        self._items = {"positions": {}, "orders": {}, "trades": {}}
+        self._seeded_at = {}
+        self._since = {}
+
+    def reset(self, account_id):
+        """Forget everything for ``account_id``; used on (re)subscribe, when events may be missed."""
+        with self._lock:
+            for items in self._items.values():
+                items[account_id] = {}
+            self._seeded_at.pop(account_id, None)
+            self._since[account_id] = datetime.now(timezone.utc)
+
+    def clear(self):
+        """Drop all state; every read falls back to REST until the next subscribe."""
+        with self._lock:
+            self._items = {"positions": {}, "orders": {}, "trades": {}}
+            self._seeded_at.clear()
+            self._since.clear()
+
+    def seed_positions(self, account_id, positions):
+        with self._lock:
+            if account_id not in self._since:
+                return
+            self._items["positions"][account_id] = {p.get("id"): p for p in positions}
+            self._seeded_at[account_id] = time.monotonic()
+
+    def apply(self, kind, payload):
+        """Upsert one hub event payload (``{"data": {...}}`` or the bare record)."""
+        record = payload.get("data") if isinstance(payload.get("data"), dict) else payload
+        account_id = record.get("accountId")
+        created_at = None if kind == "positions" else _parse_time(record.get("creationTimestamp"))
+        with self._lock:
+            items = self._items[kind].get(account_id)
+            if items is None:
+                return
+            if kind == "positions":
+                # Hub events carry ``size`` while some REST payloads use ``quantity``; either
+                # non-zero keeps the position, and a zero/missing pair means it was closed.
+                if record.get("size") or record.get("quantity"):
+                    items[record.get("id")] = record
+                else:
+                    items.pop(record.get("id"), None)
+            else:
+                items[record.get("id")] = (created_at, record)
+
+    def positions(self, account_id):
+        """Return cached positions, or ``None`` when unseeded or older than the TTL."""
+        with self._lock:
+            seeded_at = self._seeded_at.get(account_id)
+            if seeded_at is None or time.monotonic() - seeded_at > self.ttl:
+                return None
+            return list(self._items["positions"][account_id].values())
+
+    def search(self, kind, account_id, start_time, end_time):
+        """Return cached orders/trades created since ``start_time``, or ``None`` if not covered."""
+        start = _as_utc(start_time)
+        with self._lock:
+            since = self._since.get(account_id)
+            if end_time is not None or since is None or start is None or start < since:
+                return None
+            entries = list(self._items[kind][account_id].values())
+        return [record for created_at, record in entries if (created_at or since) >= start]
+
+
+def _ttl_cache(ttl):
+    """Memoize a client method's successful results for ``ttl`` seconds.
+
+    Entries live on the instance (``self._ttl_entries``) so clients never share
+    account data. ``None`` results and ``{"success": false}`` bodies (the gateway reports
+    most failures as HTTP 200) are not stored, so failed lookups are retried.
+    Lookups take no lock: each entry is published with a single dict assignment of a
+    ``(timestamp, value)`` tuple, so readers see either the old entry or the new one.
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+            entry = self._ttl_entries.get(key)
+            now = time.monotonic()
+            if entry is not None and now - entry[0] < ttl:
+                return entry[1]
+            value = fn(self, *args, **kwargs)
+            if value is not None and not (isinstance(value, dict) and value.get("success") is False):
+                self._ttl_entries[key] = (now, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
 class TopstepXClient:
     def __init__(self):
         self.base_url = os.getenv('TOPSTEPX_BASE_URL')
@@ -21,18 +586,179 @@ class TopstepXClient:
         self.username = os.getenv('TOPSTEPX_USERNAME')
         self.api_key = os.getenv('TOPSTEPX_API_KEY')
         self.token = None
+        self.session_ttl = float(os.getenv('TOPSTEPX_SESSION_TTL_HOURS', '24')) * 3600
+        self._session_expires_at = 0.0
+        self._auth_lock = threading.Lock()
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=_READ_RETRY)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if self.base_url:
+            order_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=_ORDER_RETRY)
+            self.session.mount(f"{self.base_url}/api/Order/place", order_adapter)
+            self.session.mount(f"{self.base_url}/api/Order/cancel", order_adapter)
+        self.aclient = None
+        self._aclient_loop = None
+        self._atransport = None  # httpx transport override for the async client; injectable for tests
+        rps = float(os.getenv('TOPSTEPX_RPS', '8'))
+        self._bucket = TokenBucket(rate=rps * (1 - _ORDER_RATE_SHARE), capacity=12)
+        self._order_bucket = TokenBucket(rate=rps * _ORDER_RATE_SHARE, capacity=4)
+        self._prepared = {}
+        self._ttl_entries = {}
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self.bar_cache = BarCache(os.getenv('TOPSTEPX_CACHE', './.cache/bars'))
+        self.streams = UserStreamCache(ttl=float(os.getenv('TOPSTEPX_STREAM_TTL', '60')))
+        self._user_hub = None
+        self._stream_accounts = []
+
+    def _post(self, path, payload, timeout=30, stream=False):
+        """POST ``payload`` to ``path`` on the REST session, paced by the rate limiter.
+
+        Every call other than the login itself first makes sure the session token is current;
+        if the login fails the request is not sent and a 401 response is returned instead.
+        """
+        if path != _AUTH_PATH and not self.ensure_authenticated():
+            return self._unauthenticated_response(path)
+        bucket = self._order_bucket if path in _ORDER_PATHS else self._bucket
+        bucket.acquire()
+        if path in _PREPARED_PATHS:
+            prepared, settings = self._prepared_request(path)
+            request = prepared.copy()
+            request.body = orjson.dumps(payload)
+            request.headers["Content-Length"] = str(len(request.body))
+            response = self.session.send(request, timeout=timeout, **dict(settings, stream=stream))
+        else:
+            response = self.session.post(
+                f"{self.base_url}{path}",
+                data=orjson.dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=timeout,
+                stream=stream,
+            )
+        if response.status_code == 429:
+            self._penalize(_retry_after_seconds(response))
+        return response
+
+    def _unauthenticated_response(self, path):
+        """Stand-in 401 for a request that was not sent because the login failed."""
+        response = requests.Response()
+        response.status_code = 401
+        response.reason = "Not authenticated"
+        response.url = f"{self.base_url}{path}"
+        response._content = b""
+        response.raw = io.BytesIO(b"")  # streamed callers close the response, which closes ``raw``
+        return response
+
+    def _penalize(self, seconds):
+        """Apply a gateway Retry-After to both buckets: the limit covers all traffic."""
+        self._bucket.penalize(seconds)
+        self._order_bucket.penalize(seconds)
+
+    def _prepared_request(self, path):
+        """Return the cached request template and send settings for a hot ``path``.
+
+        Building these once skips the per-call header/cookie merge and environment
+        lookup in ``Session.request``; templates are dropped when the token changes.
+        """
+        cached = self._prepared.get(path)
+        if cached is None:
+            url = f"{self.base_url}{path}"
+            request = requests.Request("POST", url, headers=_JSON_HEADERS)
+            settings = self.session.merge_environment_settings(url, {}, None, None, None)
+            cached = self._prepared[path] = (self.session.prepare_request(request), settings)
+        return cached
+
+    def _coalesce(self, path, payload, fetch):
+        """Run ``fetch()`` once for identical concurrent requests and share its result.
+
+        Requests are keyed by ``(path, payload)``; callers that arrive while a matching
+        request is in flight wait for it instead of issuing their own. Shared results
+        must be treated as read-only.
+        """
+        body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        key = (path, hashlib.blake2b(body, digest_size=16).hexdigest())
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        if not owner:
+            return future.result()
+
+        try:
+            result = fetch()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    async def _apost(self, path, payload):
+        """Async variant of :meth:`_post` on the shared ``httpx.AsyncClient``."""
+        if not self._session_valid():
+            # Logins are rare; run the blocking one off the event loop.
+            if not await asyncio.to_thread(self.ensure_authenticated):
+                import httpx
+
+                return httpx.Response(401, request=httpx.Request("POST", f"{self.base_url}{path}"))
+        await self._bucket.aacquire()
+        response = await self._async_client().post(path, content=orjson.dumps(payload), headers=_JSON_HEADERS)
+        if response.status_code == 429:
+            self._penalize(_retry_after_seconds(response))
+        return response
+
+    def _async_client(self):
+        """Return the shared ``httpx.AsyncClient`` for the running event loop.
+
+        All async calls on one loop share this client. Over HTTP/2 concurrent requests are
+        multiplexed as streams on a handful of connections, so the pool is kept small
+        rather than opening a TCP+TLS connection per in-flight request. An httpx client is
+        bound to the loop it first ran on, so a new one is built when the loop changes
+        (e.g. across ``asyncio.run`` calls); the old loop is gone and cannot close it.
+        """
+        loop = asyncio.get_running_loop()
+        if self.aclient is None or self._aclient_loop is not loop:
+            import httpx
+
+            headers = {'Authorization': f'Bearer {self.token}'} if self.token else {}
+            self.aclient = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=True,
+                headers=headers,
+                limits=httpx.Limits(max_keepalive_connections=8, max_connections=8),
+                timeout=30,
+                transport=self._atransport,
+            )
+            self._aclient_loop = loop
+        return self.aclient
+
+    async def aclose(self):
+        """Close the async client; it is recreated lazily on the next async call."""
+        if self.aclient is not None:
+            await self.aclient.aclose()
+            self.aclient = None
+            self._aclient_loop = None
 
     def authenticate(self):
         """Authenticate and get JWT token."""
-        url = f"{self.base_url}/api/Auth/loginKey"
         payload = {"username": self.username, "apiKey": self.api_key}
-        response = self.session.post(url, json=payload)
+        response = self._post(_AUTH_PATH, payload)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get('success'):
                 self.token = data['token']
+                self._session_expires_at = time.monotonic() + self.session_ttl
                 self.session.headers.update({'Authorization': f'Bearer {self.token}'})
+                self._prepared.clear()
+                self.refresh()
+                if self.aclient is not None:
+                    self.aclient.headers['Authorization'] = f'Bearer {self.token}'
                 return True
             else:
                 print(f"Auth failed: {data.get('message')}")
@@ -40,15 +766,39 @@ class TopstepXClient:
             print(f"Auth request failed: {response.status_code}")
         return False
 
+    def ensure_authenticated(self):
+        """Authenticate only if there is no token or it is older than ``TOPSTEPX_SESSION_TTL_HOURS``.
+
+        Safe to call before every request from several threads; at most one login runs.
+        """
+        if self._session_valid():
+            return True
+        with self._auth_lock:
+            if self._session_valid():
+                return True
+            return self.authenticate()
+
+    def _session_valid(self):
+        return bool(self.token) and time.monotonic() < self._session_expires_at
+
+    def _access_token(self):
+        """Token factory for hub (re)connects, re-authenticating once the session has expired."""
+        self.ensure_authenticated()
+        return self.token
+
+    def refresh(self):
+        """Drop cached account and contract lookups so the next call hits the API."""
+        self._ttl_entries.clear()
+
+    @_ttl_cache(60)
     def get_accounts(self):
-        """Retrieve trading accounts."""
-        url = f"{self.base_url}/api/Account/search"
-        response = self.session.post(url, json={"onlyActiveAccounts": True})
+        """Retrieve trading accounts (cached for 60s)."""
+        response = self._post("/api/Account/search", {"onlyActiveAccounts": True})
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         return None
 
-    def retrieve_bars(
+    def _bars_payload(
         self,
         contract_id,
         start_time,
@@ -59,50 +809,15 @@ class TopstepXClient:
         include_partial_bar=False,
         live=False,
     ):
-        """Retrieve historical bars via /api/History/retrieveBars."""
-
-        def _to_iso8601(value):
-            if isinstance(value, str):
-                return value
-            if not isinstance(value, datetime):
-                raise TypeError("start_time/end_time must be datetime or ISO string")
-            if value.tzinfo is None:
-                value = value.replace(tzinfo=timezone.utc)
-            else:
-                value = value.astimezone(timezone.utc)
-            return value.isoformat(timespec="seconds").replace("+00:00", "Z")
-
-        unit_map = {
-            "second": 1,
-            "seconds": 1,
-            "sec": 1,
-            "s": 1,
-            "minute": 2,
-            "minutes": 2,
-            "min": 2,
-            "m": 2,
-            "hour": 3,
-            "hours": 3,
-            "h": 3,
-            "day": 4,
-            "days": 4,
-            "d": 4,
-            "week": 5,
-            "weeks": 5,
-            "w": 5,
-            "month": 6,
-            "months": 6,
-            "mo": 6,
-        }
-
+        """Build the /api/History/retrieveBars request body."""
         resolved_unit = unit
         if isinstance(unit, str):
-            key = unit.lower().strip()
-            if key not in unit_map:
+            # Exact aliases hit directly; only odd casing/whitespace pays for normalisation.
+            resolved_unit = _UNIT_MAP.get(unit) or _UNIT_MAP.get(unit.lower().strip())
+            if resolved_unit is None:
                 raise ValueError(f"Unsupported time unit '{unit}'")
-            resolved_unit = unit_map[key]
 
-        payload = {
+        return {
             "contractId": contract_id,
             "live": bool(live),
             "startTime": _to_iso8601(start_time),
@@ -113,41 +828,152 @@ class TopstepXClient:
             "includePartialBar": bool(include_partial_bar),
         }
 
-        url = f"{self.base_url}/api/History/retrieveBars"
-        response = self.session.post(url, json=payload, timeout=30)
+    @staticmethod
+    def _bars_data(data):
+        if not data.get("success", False):
+            print(f"Retrieve bars unsuccessful: {data}")
+        return data
+
+    def retrieve_bars(
+        self,
+        contract_id,
+        start_time,
+        end_time,
+        unit,
+        unit_number=1,
+        limit=2000,
+        include_partial_bar=False,
+        live=False,
+        as_array=False,
+    ):
+        """Retrieve historical bars via /api/History/retrieveBars.
+
+        Returns the response dict with ``bars`` as a list of ``{t, o, h, l, c, v}`` dicts,
+        oldest first. With ``as_array=True`` the list is replaced by ``bars_array``, a NumPy
+        structured array (naive-UTC ``datetime64[ns]`` ``t``, float64 prices, int64 ``v``)
+        that is not JSON-serializable. Failed responses are returned unchanged, or ``None``
+        when the request itself failed.
+        """
+        payload = self._bars_payload(
+            contract_id, start_time, end_time, unit, unit_number, limit, include_partial_bar, live
+        )
+        cached, fetch_payload = self.bar_cache.split(payload)
+        data = {"success": True, "bars": []}
+        if fetch_payload is not None:
+            data = self._coalesce(
+                "/api/History/retrieveBars", fetch_payload, lambda: self._fetch_bars(fetch_payload)
+            )
+            if data is None or not data.get("success", False):
+                return data  # a failed tail is returned as is, never mixed with cached bars
+            self.bar_cache.store(fetch_payload, data)
+        return self.bar_cache.merge(payload, cached, data, as_array)
+
+    def _fetch_bars(self, payload):
+        with self._post("/api/History/retrieveBars", payload, stream=True) as response:
+            try:
+                response.raise_for_status()
+            except requests.HTTPError as exc:
+                print(f"Retrieve bars request failed: {exc} | Payload: {payload}")
+                try:
+                    print(response.text)
+                except Exception:  # pragma: no cover - best effort logging
+                    pass
+                return None
+
+            try:
+                data = _decode_json(response, "bars", _STREAM_PARSE_BYTES)
+            except ValueError:  # orjson.JSONDecodeError or a malformed streamed body
+                print("Retrieve bars: response was not valid JSON")
+                return None
+
+        return self._bars_data(data)
+
+    async def aretrieve_bars(
+        self,
+        contract_id,
+        start_time,
+        end_time,
+        unit,
+        unit_number=1,
+        limit=2000,
+        include_partial_bar=False,
+        live=False,
+        as_array=False,
+    ):
+        """Async variant of :meth:`retrieve_bars`."""
+        payload = self._bars_payload(
+            contract_id, start_time, end_time, unit, unit_number, limit, include_partial_bar, live
+        )
+        cached, fetch_payload = self.bar_cache.split(payload)
+        data = {"success": True, "bars": []}
+        if fetch_payload is not None:
+            data = await self._afetch_bars(fetch_payload)
+            if data is None or not data.get("success", False):
+                return data  # a failed tail is returned as is, never mixed with cached bars
+            self.bar_cache.store(fetch_payload, data)
+        return self.bar_cache.merge(payload, cached, data, as_array)
+
+    async def _afetch_bars(self, payload):
+        import httpx
+
+        response = await self._apost("/api/History/retrieveBars", payload)
         try:
             response.raise_for_status()
-        except requests.HTTPError as exc:
+        except httpx.HTTPStatusError as exc:
             print(f"Retrieve bars request failed: {exc} | Payload: {payload}")
-            try:
-                print(response.text)
-            except Exception:  # pragma: no cover - best effort logging
-                pass
+            print(response.text)
             return None
 
         try:
-            data = response.json()
-        except json.JSONDecodeError:
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
             print("Retrieve bars: response was not valid JSON")
             return None
 
-        if not data.get("success", False):
-            print(f"Retrieve bars unsuccessful: {data}")
-        return data
+        return self._bars_data(data)
+
+    async def abatch_retrieve_bars(self, specs):
+        """Fetch several bar windows concurrently.
+
+        ``specs`` is a list of keyword dicts for :meth:`retrieve_bars`; results are
+        returned in the same order.
+        """
+        return await asyncio.gather(*[self.aretrieve_bars(**spec) for spec in specs])
+
+    def batch_retrieve_bars(self, specs):
+        """Blocking wrapper around :meth:`abatch_retrieve_bars` for sync callers."""
+
+        async def _run():
+            try:
+                return await self.abatch_retrieve_bars(specs)
+            finally:
+                # The async client is bound to this event loop, which asyncio.run closes.
+                await self.aclose()
+
+        return asyncio.run(_run())
 
     def search_contracts(self, symbol, live=True):
         """Search for contracts by symbol."""
-        url = f"{self.base_url}/api/Contract/search"
         payload = {"searchText": symbol, "live": live}
-        response = self.session.post(url, json=payload)
-        if response.status_code == 200:
-            return response.json()
-        return None
 
+        def _fetch():
+            response = self._post("/api/Contract/search", payload)
+            if response.status_code == 200:
+                return orjson.loads(response.content)
+            return None
+
+        return self._coalesce("/api/Contract/search", payload, _fetch)
+
+    @_ttl_cache(3600)
     def get_contract_by_id(self, contract_id):
-        """Retrieve a specific contract definition."""
-        url = f"{self.base_url}/api/Contract/searchById"
-        response = self.session.post(url, json={"contractId": contract_id}, timeout=15)
+        """Retrieve a specific contract definition (cached for an hour)."""
+        payload = {"contractId": contract_id}
+        return self._coalesce(
+            "/api/Contract/searchById", payload, lambda: self._fetch_contract(contract_id, payload)
+        )
+
+    def _fetch_contract(self, contract_id, payload):
+        response = self._post("/api/Contract/searchById", payload, timeout=15)
         try:
             response.raise_for_status()
         except requests.HTTPError as exc:
@@ -155,8 +981,8 @@ class TopstepXClient:
             return None
 
         try:
-            data = response.json()
-        except json.JSONDecodeError:
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
             print(f"Contract lookup for {contract_id} returned non-JSON response")
             return None
 
@@ -166,7 +992,6 @@ class TopstepXClient:
 
     def place_order(self, account_id, contract_id, side, size, order_type='Market', **kwargs):
         """Place an order."""
-        url = f"{self.base_url}/api/Order/place"
         payload = {
             "accountId": account_id,
             "contractId": contract_id,
@@ -175,26 +1000,183 @@ class TopstepXClient:
             "size": size,
             **kwargs
         }
-        response = self.session.post(url, json=payload)
+        response = self._post("/api/Order/place", payload)
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         return None
 
     def cancel_order(self, order_id):
         """Cancel an order."""
-        url = f"{self.base_url}/api/Order/cancel"
-        response = self.session.post(url, json={"orderId": order_id})
+        response = self._post("/api/Order/cancel", {"orderId": order_id})
         return response.status_code == 200
 
+    def connect_streams(self, account_ids):
+        """Subscribe to User Hub order/position/trade events for ``account_ids``.
+
+        While connected, get_positions/search_orders/search_trades answer from the
+        stream cache and only fall back to REST when it is stale or does not cover
+        the requested window.
+        """
+        from signalrcore.hub_connection_builder import HubConnectionBuilder
+
+        self._stream_accounts = list(account_ids)
+        hub = (
+            HubConnectionBuilder()
+            .with_url(self.user_hub_url, options={"access_token_factory": self._access_token})
+            .with_automatic_reconnect({"type": "raw", "keep_alive_interval": 10, "reconnect_interval": 5})
+            .build()
+        )
+        hub.on("GatewayUserOrder", lambda args: self._on_stream_event("orders", args))
+        hub.on("GatewayUserPosition", lambda args: self._on_stream_event("positions", args))
+        hub.on("GatewayUserTrade", lambda args: self._on_stream_event("trades", args))
+        hub.on_open(self._subscribe_streams)
+        hub.on_reconnect(self._subscribe_streams)
+        hub.on_close(self._on_streams_closed)
+        self._user_hub = hub
+        return hub.start()
+
+    def disconnect_streams(self):
+        """Stop the User Hub connection; reads go back to REST."""
+        hub, self._user_hub = self._user_hub, None
+        if hub is not None:
+            hub.stop()
+        self._on_streams_closed()
+
+    def _subscribe_streams(self):
+        for account_id in self._stream_accounts:
+            self.streams.reset(account_id)
+            self._user_hub.send("SubscribeOrders", [account_id])
+            self._user_hub.send("SubscribePositions", [account_id])
+            self._user_hub.send("SubscribeTrades", [account_id])
+
+    def _on_stream_event(self, kind, args):
+        for payload in args or []:
+            if isinstance(payload, dict):
+                self.streams.apply(kind, payload)
+
+    def _on_streams_closed(self):
+        self.streams.clear()
+
     def get_positions(self, account_id):
         """Get open positions."""
-        url = f"{self.base_url}/api/Position/search"
+        cached = self.streams.positions(account_id)
+        if cached is not None:
+            return {"success": True, "positions": cached}
+        payload = {"accountId": account_id}
+        response = self._post("/api/Position/search", payload)
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
+            self.streams.seed_positions(account_id, data.get("positions") or [])
+            return data
+        return None
+
+    async def aget_positions(self, account_id):
+        """Async variant of :meth:`get_positions`."""
+        cached = self.streams.positions(account_id)
+        if cached is not None:
+            return {"success": True, "positions": cached}
         payload = {"accountId": account_id}
-        response = self.session.post(url, json=payload)
+        response = await self._apost("/api/Position/search", payload)
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
+            self.streams.seed_positions(account_id, data.get("positions") or [])
+            return data
+        return None
+
+    @staticmethod
+    def _search_payload(account_id, start_time, end_time):
+        payload = {"accountId": account_id, "startTimestamp": _to_iso8601(start_time)}
+        if end_time is not None:
+            payload["endTimestamp"] = _to_iso8601(end_time)
+        return payload
+
+    def search_orders(self, account_id, start_time, end_time=None):
+        """Search orders for an account between start_time and end_time."""
+        cached = self.streams.search("orders", account_id, start_time, end_time)
+        if cached is not None:
+            return {"success": True, "orders": cached}
+        payload = self._search_payload(account_id, start_time, end_time)
+        with self._post("/api/Order/search", payload, stream=True) as response:
+            if response.status_code == 200:
+                return _decode_json(response, "orders", _STREAM_SEARCH_BYTES)
+        return None
+
+    async def asearch_orders(self, account_id, start_time, end_time=None):
+        """Async variant of :meth:`search_orders`."""
+        cached = self.streams.search("orders", account_id, start_time, end_time)
+        if cached is not None:
+            return {"success": True, "orders": cached}
+        payload = self._search_payload(account_id, start_time, end_time)
+        response = await self._apost("/api/Order/search", payload)
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         return None
 
+    def search_trades(self, account_id, start_time, end_time=None):
+        """Search filled trades for an account between start_time and end_time."""
+        cached = self.streams.search("trades", account_id, start_time, end_time)
+        if cached is not None:
+            return {"success": True, "trades": cached}
+        payload = self._search_payload(account_id, start_time, end_time)
+        with self._post("/api/Trade/search", payload, stream=True) as response:
+            if response.status_code == 200:
+                return _decode_json(response, "trades", _STREAM_SEARCH_BYTES)
+        return None
+
+    async def asearch_trades(self, account_id, start_time, end_time=None):
+        """Async variant of :meth:`search_trades`."""
+        cached = self.streams.search("trades", account_id, start_time, end_time)
+        if cached is not None:
+            return {"success": True, "trades": cached}
+        payload = self._search_payload(account_id, start_time, end_time)
+        response = await self._apost("/api/Trade/search", payload)
+        if response.status_code == 200:
+            return orjson.loads(response.content)
+        return None
+
+    async def _asearch_windows(self, search, key, account_id, start_time, end_time, window):
+        """Split ``[start_time, end_time]`` into ``window``-sized slices and fetch them concurrently.
+
+        Records are yielded in window order, de-duplicated by id across window edges.
+        Concurrency is capped so the fan-out cooperates with the rate limiter.
+        """
+        if window <= timedelta(0):
+            raise ValueError("window must be a positive timedelta")
+        start = _as_utc(start_time)
+        end = _as_utc(end_time) if end_time is not None else datetime.now(timezone.utc)
+        if start is None or end is None:
+            raise ValueError("start_time/end_time must be datetime or ISO string")
+
+        bounds = []
+        while start < end:
+            bounds.append((start, min(start + window, end)))
+            start += window
+
+        semaphore = asyncio.Semaphore(8)
+
+        async def _fetch(lower, upper):
+            async with semaphore:
+                return await search(account_id, lower, upper)
+
+        pages = await asyncio.gather(*[_fetch(lower, upper) for lower, upper in bounds])
+        seen = set()
+        for page in pages:
+            for record in (page or {}).get(key) or []:
+                record_id = record.get("id")
+                if record_id is not None:
+                    if record_id in seen:
+                        continue
+                    seen.add(record_id)
+                yield record
+
+    def aiter_all_orders(self, account_id, start_time, end_time=None, window=timedelta(days=7)):
+        """Async-iterate every order in a long range, fetching ``window`` slices concurrently."""
+        return self._asearch_windows(self.asearch_orders, "orders", account_id, start_time, end_time, window)
+
+    def aiter_all_trades(self, account_id, start_time, end_time=None, window=timedelta(days=7)):
+        """Async-iterate every trade in a long range, fetching ``window`` slices concurrently."""
+        return self._asearch_windows(self.asearch_trades, "trades", account_id, start_time, end_time, window)
+
     def get_quotes(self, contract_id):
         """Get current quote for contract (if available via REST). Placeholder."""
         # TopstepX may not have REST quotes; use SignalR
@@ -207,7 +1189,7 @@ class TopstepXClient:
 
 if __name__ == "__main__":
     client = TopstepXClient()
-    if client.authenticate():
+    if client.ensure_authenticated():
         print("Authenticated")
         accounts = client.get_accounts()
         print(f"Accounts: {accounts}")
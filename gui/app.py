@@ -2,44 +2,56 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any, Dict
 
+import orjson
 import streamlit as st
 import yaml
 
 from gui import compliance_panel, dashboard
+from src.utils import file_mtime_ns, load_yaml
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 STATUS_PATH = REPO_ROOT / "config" / "status.json"
 CONFIG_PATH = REPO_ROOT / "config" / "config.yaml"
 
 
-@st.cache_data(show_spinner=False)
-def _load_status() -> Dict[str, Any]:
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_status_cached(mtime_ns: int) -> Dict[str, Any]:
+    """Parse status.json; ``mtime_ns`` keys the cache so refreshes are picked up.
+
+    Cached as a shared resource to skip per-rerun copies; callers must not mutate it.
+    """
     if not STATUS_PATH.exists():
         return {}
     try:
-        with STATUS_PATH.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
-    except json.JSONDecodeError:
+        return orjson.loads(STATUS_PATH.read_bytes())
+    except orjson.JSONDecodeError:
         st.error("`config/status.json` is not valid JSON.")
         return {}
 
 
-@st.cache_data(show_spinner=False)
-def _load_config() -> Dict[str, Any]:
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_config_cached(mtime_ns: int) -> Dict[str, Any]:
+    """Parse config.yaml; ``mtime_ns`` keys the cache so edits are picked up (read-only)."""
     if not CONFIG_PATH.exists():
         return {}
     try:
-        with CONFIG_PATH.open("r", encoding="utf-8") as handle:
-            return yaml.safe_load(handle) or {}
+        return load_yaml(CONFIG_PATH) or {}
     except yaml.YAMLError as exc:
         st.error(f"Failed to parse `config/config.yaml`: {exc}")
         return {}
 
 
+def _load_status() -> Dict[str, Any]:
+    return _load_status_cached(file_mtime_ns(STATUS_PATH))
+
+
+def _load_config() -> Dict[str, Any]:
+    return _load_config_cached(file_mtime_ns(CONFIG_PATH))
+
+
 def _sidebar(status: Dict[str, Any]) -> str:
     st.sidebar.title("Navigation")
     page = st.sidebar.radio("Views", ["Overview", "Compliance"], index=0)
@@ -64,7 +76,7 @@ def main() -> None:
     page = _sidebar(status)
 
     if page == "Overview":
-        dashboard.render(status, config)
+        dashboard.render(_load_status, config)
     elif page == "Compliance":
         compliance_panel.render(status)
 
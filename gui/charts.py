@@ -2,23 +2,81 @@
 
 from __future__ import annotations
 
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any
 
-import pandas as pd
-import plotly.graph_objects as go
 import streamlit as st
 
+from src.utils import atomic_write_bytes, file_mtime_ns
+
+if TYPE_CHECKING:  # pandas/plotly are imported lazily so other pages don't pay for them
+    import pandas as pd
+
+# Roughly one candle per horizontal pixel pair on a typical wide layout.
+MAX_PLOTTED_CANDLES = 1500
+
+_DATASET_MODES: Dict[str, str] = {
+    "Front Contract": "{tf}.csv",
+    "Stitched Chain": "{tf}_chain.csv",
+}
+
+
+@lru_cache(maxsize=1)
+def _go():
+    import plotly.graph_objects as go
+
+    return go
+
+
+# Parquet schema metadata keys recording which CSV a sidecar was converted from.
+_SOURCE_MTIME_KEY = b"source_mtime_ns"
+_SOURCE_SIZE_KEY = b"source_size"
+
 
 @st.cache_data(show_spinner=False)
-def _load_candles(path: Path) -> pd.DataFrame | None:
-    if not path.exists():
+def _load_candles(path_str: str, mtime_ns: int) -> pd.DataFrame | None:
+    """Load candles for ``path_str``; ``mtime_ns`` keys the cache so edits invalidate it.
+
+    A Parquet copy is written next to the CSV on first load and reused while the CSV's
+    mtime and size still match the ones recorded in its schema metadata.
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = Path(path_str)
+    try:
+        source = os.stat(path)
+    except OSError:
         return None
+    signature = {
+        _SOURCE_MTIME_KEY: str(source.st_mtime_ns).encode(),
+        _SOURCE_SIZE_KEY: str(source.st_size).encode(),
+    }
+    parquet_path = path.with_suffix(".parquet")
+    try:
+        metadata = pq.read_schema(parquet_path).metadata or {}
+    except (OSError, pa.ArrowException):
+        metadata = {}
     try:
-        return pd.read_csv(path, parse_dates=["timestamp"])
+        if all(metadata.get(key) == value for key, value in signature.items()):
+            return pd.read_parquet(parquet_path)
+        data = pd.read_csv(path, parse_dates=["timestamp"], engine="pyarrow")
     except Exception as exc:  # pragma: no cover - defensive for malformed data files
         st.warning(f"Failed to load {path.name}: {exc}")
         return None
+    table = pa.Table.from_pandas(data)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), **signature})
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, compression="zstd")
+    try:
+        # Swapped in atomically, so another session never reads a partial file.
+        atomic_write_bytes(parquet_path, sink.getvalue().to_pybytes())
+    except OSError:  # pragma: no cover - read-only data directory
+        pass
+    return data
 
 
 def _timeframe_options(status: Dict[str, Any]) -> list[str]:
@@ -29,14 +87,26 @@ def _timeframe_options(status: Dict[str, Any]) -> list[str]:
     return ["1min", "5min", "15min", "1hour", "1day"]
 
 
-def _dataset_modes() -> Dict[str, str]:
-    return {
-        "Front Contract": "{tf}.csv",
-        "Stitched Chain": "{tf}_chain.csv",
-    }
+def _downsample_ohlc(df: pd.DataFrame, target_points: int = MAX_PLOTTED_CANDLES) -> pd.DataFrame:
+    """Aggregate consecutive candles into buckets so at most ``target_points`` are plotted."""
+    if len(df) <= 2 * target_points:
+        return df
+    import numpy as np
+
+    bucket = -(-len(df) // target_points)
+    groups = np.arange(len(df)) // bucket
+    return df.groupby(groups).agg(
+        timestamp=("timestamp", "first"),
+        open=("open", "first"),
+        high=("high", "max"),
+        low=("low", "min"),
+        close=("close", "last"),
+    )
 
 
 def _render_candlestick(df: pd.DataFrame, title: str) -> None:
+    go = _go()
+    df = _downsample_ohlc(df)
     figure = go.Figure(
         data=[
             go.Candlestick(
@@ -61,24 +131,43 @@ def render(data_dir: Path, status: Dict[str, Any]) -> None:
     timeframes = _timeframe_options(status)
     default_timeframe = "1hour" if "1hour" in timeframes else timeframes[0]
     timeframe = st.selectbox("Timeframe", options=timeframes, index=timeframes.index(default_timeframe))
-    dataset_labels = list(_dataset_modes().keys())
-    dataset_label = st.radio("Dataset", options=dataset_labels, horizontal=True)
+    dataset_label = st.radio("Dataset", options=list(_DATASET_MODES), horizontal=True)
 
-    filename_template = _dataset_modes()[dataset_label]
+    filename_template = _DATASET_MODES[dataset_label]
     csv_name = f"gold_candles_{filename_template.format(tf=timeframe)}"
     csv_path = data_dir / csv_name
 
-    data = _load_candles(csv_path)
+    # Keep the sorted frame in session state so slider reruns of the chart fragment skip
+    # the load and sort; it is only replaced when the file on disk changes.
+    state_key = f"candles:{timeframe}:{dataset_label}"
+    mtime_ns = file_mtime_ns(csv_path)
+    cached = st.session_state.get(state_key)
+    if cached is None or cached[0] != mtime_ns:
+        data = _load_candles(str(csv_path), mtime_ns)
+        if data is not None and not data.empty:
+            # Data files are written in time order; only pay for a sort when they are not.
+            # is_monotonic_increasing is False on NaT, so such frames still get sorted.
+            if not data["timestamp"].is_monotonic_increasing:
+                data = data.sort_values("timestamp", kind="mergesort")
+        st.session_state[state_key] = (mtime_ns, data)
+
+    data = st.session_state[state_key][1]
     if data is None or data.empty:
         st.warning(f"No candles available for {timeframe} ({dataset_label.lower()}).")
         return
 
-    data = data.sort_values("timestamp")
-    max_rows = min(len(data), 5000)
-    if max_rows < 50:
+    if len(data) < 50:
         st.warning("Not enough rows to display a chart.")
         return
 
+    _render_chart_panel(state_key, f"{timeframe} {dataset_label}")
+
+
+@st.fragment
+def _render_chart_panel(state_key: str, title: str) -> None:
+    """Render the lookback slider and chart; reruns on slider changes stay in this fragment."""
+    data = st.session_state[state_key][1]
+    max_rows = min(len(data), 5000)
     min_rows = min(200, max_rows)
     default_rows = min(1000, max_rows)
     if default_rows < min_rows:
@@ -93,14 +182,15 @@ def render(data_dir: Path, status: Dict[str, Any]) -> None:
     )
     recent = data.tail(lookback)
 
-    latest_row = recent.iloc[-1]
+    close = recent["close"].to_numpy()
+    latest_close = float(close[-1])
     st.metric(
         "Latest Close",
-        f"{latest_row['close']:.2f}",
-        delta=f"{latest_row['close'] - recent.iloc[0]['close']:.2f}",
+        f"{latest_close:.2f}",
+        delta=f"{latest_close - float(close[0]):.2f}",
     )
 
-    _render_candlestick(recent, f"{timeframe} {dataset_label}")
+    _render_candlestick(recent, title)
 
     with st.expander("Summary Statistics"):
         st.dataframe(
@@ -111,4 +201,4 @@ def render(data_dir: Path, status: Dict[str, Any]) -> None:
         )
 
     with st.expander("Raw Data Preview"):
-        st.dataframe(recent.tail(200), use_container_width=True)
\ No newline at end of file
+        st.dataframe(recent.iloc[-200:], use_container_width=True, hide_index=True)
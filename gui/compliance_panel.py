@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 import streamlit as st
 
+# (status, ctx) for the last snapshot formatted. gui/app.py serves one shared status dict
+# per status.json version, so its identity marks the snapshot; the tuple is swapped whole.
+_last_guardrails: Tuple[Dict[str, Any], Dict[str, Any]] | None = None
+
 
 def _ratio(numerator: float | int | None, denominator: float | int | None) -> float:
     if not numerator or not denominator:
@@ -15,6 +19,28 @@ def _ratio(numerator: float | int | None, denominator: float | int | None) -> fl
     return max(0.0, min(1.0, float(numerator) / float(denominator)))
 
 
+def _guardrails_ctx(status: Dict[str, Any]) -> Dict[str, Any]:
+    """Format the guardrail labels, ratios and rule ordering once per status snapshot."""
+    global _last_guardrails
+    last = _last_guardrails
+    if last is not None and last[0] is status:
+        return last[1]
+
+    daily_used = status.get("daily_loss_used")
+    daily_cap = status.get("daily_loss_cap")
+    trailing_dd = status.get("trailing_dd")
+    kill_switch = status.get("killswitch_threshold")
+    ctx = {
+        "daily_label": f"{daily_used or 0:.0f}/{daily_cap or 0:.0f}",
+        "daily_ratio": _ratio(daily_used, daily_cap),
+        "trail_label": f"{trailing_dd or 0:.0f}/{kill_switch or 0:.0f}",
+        "trail_ratio": _ratio(trailing_dd, kill_switch),
+        "rules_sorted": sorted((status.get("rules_status", {}) or {}).items()),
+    }
+    _last_guardrails = (status, ctx)
+    return ctx
+
+
 def render(status: Dict[str, Any]) -> None:
     """Render detailed risk and rule compliance information."""
 
@@ -24,35 +50,32 @@ def render(status: Dict[str, Any]) -> None:
         st.error("Status data not available. Run `python src/main.py` to refresh.")
         return
 
+    ctx = _guardrails_ctx(status)
+
     st.subheader("Risk Guardrails")
     cols = st.columns(2)
-    daily_used = status.get("daily_loss_used")
-    daily_cap = status.get("daily_loss_cap")
-    trailing_dd = status.get("trailing_dd")
-    kill_switch = status.get("killswitch_threshold")
 
     with cols[0]:
         st.metric(
             "Daily Loss Usage",
-            f"{daily_used or 0:.0f}/{daily_cap or 0:.0f}",
+            ctx["daily_label"],
             help="Tracks progress towards the daily loss cap",
         )
-        st.progress(_ratio(daily_used, daily_cap))
+        st.progress(ctx["daily_ratio"])
 
     with cols[1]:
         st.metric(
             "Trailing Drawdown",
-            f"{trailing_dd or 0:.0f}/{kill_switch or 0:.0f}",
+            ctx["trail_label"],
             help="Trailing drawdown relative to kill-switch threshold",
         )
-        st.progress(_ratio(trailing_dd, kill_switch))
+        st.progress(ctx["trail_ratio"])
 
     st.subheader("Rule Status")
-    rules_status = status.get("rules_status", {}) or {}
-    if not rules_status:
+    if not ctx["rules_sorted"]:
         st.info("No rule status entries recorded yet.")
     else:
-        for rule, state in sorted(rules_status.items()):
+        for rule, state in ctx["rules_sorted"]:
             badge = "✅" if state == "pass" else "⚠️"
             st.write(f"{badge} **{rule.capitalize()}** — {state}")
 
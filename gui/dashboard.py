@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Callable, Dict, Any, Tuple
 
-import pandas as pd
+import orjson
 import streamlit as st
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import pandas as pd
+
 DEFAULT_START_BALANCE = 50_000
+# How often the live sections re-check status.json; unchanged files are served from cache.
+STATUS_REFRESH_SECONDS = 30
 
 
 def _safe_get(mapping: Dict[str, Any] | None, key: str, default: Any = None) -> Any:
@@ -22,6 +27,21 @@ def _format_currency(value: float | int | None) -> str:
     return f"${value:,.2f}"
 
 
+# The frame builders below use cache_resource so reruns get the cached frame itself rather
+# than an unpickled copy; callers must treat the returned frames as read-only.
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _build_exposure_df(exposures: Tuple[Tuple[str, float], ...]) -> "pd.DataFrame":
+    """Build the exposure bar-chart frame; ``exposures`` is a sorted items tuple so it hashes."""
+    import pandas as pd
+
+    return (
+        pd.DataFrame.from_records(list(exposures), columns=["contract", "exposure"])
+        .astype({"exposure": "float64"})
+        .set_index("contract")
+        .sort_values("exposure", ascending=False)
+    )
+
+
 def _render_equity_section(status: Dict[str, Any], config: Dict[str, Any]) -> None:
     combine_config = _safe_get(config, "combine", {}) or {}
     start_balance = combine_config.get("start_balance", DEFAULT_START_BALANCE)
@@ -46,32 +66,54 @@ def _render_equity_section(status: Dict[str, Any], config: Dict[str, Any]) -> No
 
     exposures = _safe_get(status, "exposure_by_symbol", {}) or {}
     if exposures:
-        exposure_df = (
-            pd.DataFrame(
-                {"contract": list(exposures.keys()), "exposure": list(exposures.values())}
-            )
-            .set_index("contract")
-            .sort_values("exposure", ascending=False)
-        )
+        exposure_df = _build_exposure_df(tuple(sorted(exposures.items())))
         st.caption("Open exposure by contract")
         st.bar_chart(exposure_df)
     else:
         st.caption("No open exposure recorded.")
 
 
+# Formatting lives in column_config rather than a pandas Styler, which re-renders every cell.
+_INVENTORY_COLUMNS = {
+    "Rows": st.column_config.NumberColumn("Rows", format="%d"),
+    "Start": st.column_config.DatetimeColumn("Start", format="YYYY-MM-DD HH:mm"),
+    "End": st.column_config.DatetimeColumn("End", format="YYYY-MM-DD HH:mm"),
+}
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _build_inventory_df(timeframes_blob: bytes) -> "pd.DataFrame":
+    """Build the typed inventory table from the serialized ``timeframes`` mapping."""
+    import pandas as pd
+
+    timeframes = orjson.loads(timeframes_blob)
+    inventory_df = pd.DataFrame.from_records(
+        [
+            (timeframe, meta.get("rows", 0), meta.get("start"), meta.get("end"))
+            for timeframe, meta in sorted(timeframes.items())
+        ],
+        columns=["timeframe", "Rows", "Start", "End"],
+        index="timeframe",
+    ).astype({"Rows": "int64"})
+    inventory_df["Start"] = pd.to_datetime(inventory_df["Start"], utc=True, errors="coerce")
+    inventory_df["End"] = pd.to_datetime(inventory_df["End"], utc=True, errors="coerce")
+    return inventory_df
+
+
 def _render_data_inventory(status: Dict[str, Any]) -> None:
     inventory = _safe_get(status, "data_inventory", {}) or {}
     timeframes = inventory.get("timeframes", {})
     shortfalls = (inventory.get("shortfalls") or {}).get("timeframes", {})
 
+    import pandas as pd
+
     st.subheader("Data Inventory")
     if timeframes:
-        inventory_df = (
-            pd.DataFrame.from_dict(timeframes, orient="index")
-            .rename(columns={"rows": "Rows", "start": "Start", "end": "End"})
-            .sort_index()
+        st.dataframe(
+            _build_inventory_df(orjson.dumps(timeframes)),
+            use_container_width=True,
+            column_config=_INVENTORY_COLUMNS,
         )
-        st.dataframe(inventory_df, use_container_width=True)
     else:
         st.info("No timeframe data captured yet. Run the data refresh pipeline.")
 
@@ -129,11 +171,15 @@ def _render_status_snapshot(status: Dict[str, Any]) -> None:
                 st.write("- ", action)
 
 
-def render(status: Dict[str, Any], config: Dict[str, Any]) -> None:
-    """Render the main dashboard view."""
-
-    st.title("TopStepAi Overview")
+@st.fragment(run_every=STATUS_REFRESH_SECONDS)
+def _render_live_sections(load_status: Callable[[], Dict[str, Any]], config: Dict[str, Any]) -> None:
+    """Redraw the status-driven sections on a timer without rerunning the whole page.
 
+    A fragment reruns with the arguments it was first given, so it takes the loader and
+    reloads status itself; the loader is mtime-keyed, so this is cheap until main.py
+    writes a new status.json.
+    """
+    status = load_status()
     if not status:
         st.error("`config/status.json` could not be loaded. Run `python src/main.py` first.")
         return
@@ -142,7 +188,15 @@ def render(status: Dict[str, Any], config: Dict[str, Any]) -> None:
     _render_status_snapshot(status)
     _render_data_inventory(status)
 
+
+def render(load_status: Callable[[], Dict[str, Any]], config: Dict[str, Any]) -> None:
+    """Render the main dashboard view; ``load_status`` returns the current status.json contents."""
+
+    st.title("TopStepAi Overview")
+
+    _render_live_sections(load_status, config)
+
     combine_config = _safe_get(config, "combine", {})
     if combine_config:
         with st.expander("Combine Configuration"):
-            st.json(combine_config)
\ No newline at end of file
+            st.json(combine_config)
@@ -1,5 +1,3 @@
-
-+
 """Validate data inventory captured in status.json against targets.
 
 This module can be scheduled (e.g., nightly) to ensure historical pulls
@@ -9,32 +7,36 @@ continue to meet expectations and to detect new contract additions.
 from __future__ import annotations
 
 import argparse
-import json
+import logging
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Iterable
 
-import yaml
+import orjson
+import pandas as pd
+
+from src.utils import atomic_write_bytes, load_yaml
 
+logger = logging.getLogger(__name__)
 
 DEFAULT_STATUS_PATH = Path("config/status.json")
 DEFAULT_CONFIG_PATH = Path("config/config.yaml")
 HISTORY_PATH = Path("monitoring/data_inventory_history.json")
+HISTORY_CONTRACTS_PATH = Path("monitoring/data_inventory_history_contracts.parquet")
+CONTRACT_COLUMNS = ["timeframe", "contract_id"]
 
 
 def load_status(path: Path) -> Dict:
     if not path.exists():
         raise FileNotFoundError(f"status file not found: {path}")
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return orjson.loads(path.read_bytes())
 
 
 def load_config(path: Path) -> Dict:
     if not path.exists():
         raise FileNotFoundError(f"config file not found: {path}")
-    with path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle)
+    return load_yaml(path)
 
 
 def _as_float(value, default: float) -> float:
@@ -44,6 +46,13 @@ def _as_float(value, default: float) -> float:
         return default
 
 
+def _contract_frame(pairs) -> pd.DataFrame:
+    """Normalise ``(timeframe, contract_id)`` pairs (or an existing frame) to a two-column frame."""
+    if isinstance(pairs, pd.DataFrame):
+        return pairs
+    return pd.DataFrame.from_records([tuple(pair) for pair in pairs], columns=CONTRACT_COLUMNS)
+
+
 def validate_inventory(status: Dict, stitch_config: Dict, baseline: Dict | None = None) -> Iterable[str]:
     issues = []
 
@@ -71,22 +80,26 @@ def validate_inventory(status: Dict, stitch_config: Dict, baseline: Dict | None
                 )
 
     # Detect new contracts vs baseline
-    current_contracts = {
-        (tf, cid)
-        for tf, mapping in contract_data.items()
-        for cid in mapping.keys()
-    }
     if baseline:
-        baseline_contracts = {tuple(entry) for entry in baseline.get("contracts", [])}
-        new_contracts = current_contracts - baseline_contracts
-        retired_contracts = baseline_contracts - current_contracts
-        if new_contracts:
+        current_contracts = _contract_frame(
+            (tf, cid) for tf, mapping in contract_data.items() for cid in mapping.keys()
+        )
+        baseline_contracts = _contract_frame(baseline.get("contracts", []))
+        # One outer join classifies every contract: left_only is new, right_only has gone missing.
+        merged = current_contracts.drop_duplicates().merge(
+            baseline_contracts.drop_duplicates(), how="outer", on=CONTRACT_COLUMNS, indicator=True, sort=True
+        )
+        new_contracts = merged.loc[merged["_merge"] == "left_only", CONTRACT_COLUMNS]
+        retired_contracts = merged.loc[merged["_merge"] == "right_only", CONTRACT_COLUMNS]
+        if not new_contracts.empty:
             issues.append(
-                "New contracts detected: " + ", ".join(f"{tf}:{cid}" for tf, cid in sorted(new_contracts))
+                "New contracts detected: "
+                + ", ".join(f"{tf}:{cid}" for tf, cid in new_contracts.itertuples(index=False))
             )
-        if retired_contracts:
+        if not retired_contracts.empty:
             issues.append(
-                "Contracts missing: " + ", ".join(f"{tf}:{cid}" for tf, cid in sorted(retired_contracts))
+                "Contracts missing: "
+                + ", ".join(f"{tf}:{cid}" for tf, cid in retired_contracts.itertuples(index=False))
             )
 
     return issues
@@ -100,23 +113,37 @@ def update_history(status: Dict) -> None:
     history_snapshot = {
         "captured_at": datetime.now(timezone.utc).isoformat(),
         "timeframes": {tf: meta.get("rows", 0) for tf, meta in timeframe_data.items()},
-        "contracts": [
+    }
+    contracts = pd.DataFrame.from_records(
+        [
             (tf, cid)
             for tf, mapping in sorted(contract_data.items())
             for cid in sorted(mapping.keys())
         ],
-    }
+        columns=CONTRACT_COLUMNS,
+    )
 
     HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with HISTORY_PATH.open("w", encoding="utf-8") as handle:
-        json.dump(history_snapshot, handle, indent=2)
+    # Sidecar first, JSON last: a snapshot JSON is only ever published after its contracts.
+    atomic_write_bytes(HISTORY_CONTRACTS_PATH, contracts.to_parquet(index=False))
+    atomic_write_bytes(HISTORY_PATH, orjson.dumps(history_snapshot, option=orjson.OPT_INDENT_2))
 
 
 def load_history() -> Dict | None:
     if not HISTORY_PATH.exists():
         return None
-    with HISTORY_PATH.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    history = orjson.loads(HISTORY_PATH.read_bytes())
+    # Older snapshots kept the contract list inline in the JSON file.
+    if "contracts" in history:
+        return history
+    if not HISTORY_CONTRACTS_PATH.exists():
+        # Diffing against no contracts would report every contract as new.
+        logger.warning(
+            "Inventory history %s has no contracts file %s; skipping baseline", HISTORY_PATH, HISTORY_CONTRACTS_PATH
+        )
+        return None
+    history["contracts"] = pd.read_parquet(HISTORY_CONTRACTS_PATH)
+    return history
 
 
 def main() -> int:
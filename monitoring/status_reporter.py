@@ -2,18 +2,24 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import os
-from typing import Dict, Iterable
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Mapping, Optional, Tuple
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+_PLACEHOLDER_RE = re.compile(r"\$\{([^}]+)\}")
 
-def _format_timeframe_summary(timeframes: Dict[str, Dict]) -> Iterable[str]:
-    for timeframe, meta in sorted(timeframes.items()):
+
+def _format_timeframe_summary(sorted_timeframes: Iterable[Tuple[str, Dict]]) -> Iterable[str]:
+    for timeframe, meta in sorted_timeframes:
         rows = meta.get("rows")
         start = meta.get("start")
         end = meta.get("end")
@@ -26,7 +32,7 @@ def format_status_message(status: Dict) -> str:
     timeframes = data_inventory.get("timeframes") or {}
     shortfalls = (data_inventory.get("shortfalls") or {}).get("timeframes", {})
 
-    for line in _format_timeframe_summary(timeframes):
+    for line in _format_timeframe_summary(sorted(timeframes.items())):
         lines.append(f" • {line}")
 
     if shortfalls:
@@ -40,20 +46,49 @@ def format_status_message(status: Dict) -> str:
     return "\n".join(lines)
 
 
+@lru_cache(maxsize=1)
+def _session() -> requests.Session:
+    """Keep-alive session shared by webhook posts in this process, created on first use."""
+    session = requests.Session()
+    # Connection failures and 429s are retried; a read timeout is not, so a slow post is never duplicated.
+    retry = Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=(429,),
+        allowed_methods=frozenset(["POST"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=retry))
+    session.headers["Content-Type"] = "application/json"
+    return session
+
+
 def post_to_slack(webhook_url: str, message: str) -> None:
     payload = {"text": message}
-    response = requests.post(webhook_url, data=json.dumps(payload), headers={"Content-Type": "application/json"}, timeout=10)
+    response = _session().post(webhook_url, data=orjson.dumps(payload), timeout=10)
     if response.status_code >= 400:
         raise RuntimeError(f"Slack webhook failed ({response.status_code}): {response.text}")
 
 
-def publish_status_report(status: Dict, monitoring_config: Dict) -> None:
+def _resolve_placeholder(value: str, env: Mapping[str, str] = os.environ) -> str:
+    """Expand ``${VAR}`` tokens from ``env``; unset variables are left as-is.
+
+    Not memoized: the environment can change between publishes (and between tests).
+    """
+    return _PLACEHOLDER_RE.sub(lambda match: env.get(match.group(1), match.group(0)), value)
+
+
+def publish_status_report(
+    status: Dict, monitoring_config: Dict, env: Optional[Mapping[str, str]] = None
+) -> None:
     message = format_status_message(status)
     logger.info("Status summary:\n%s", message)
 
     slack_webhook = monitoring_config.get("alerts_slack_webhook")
     if slack_webhook:
-        webhook_value = os.environ.get(slack_webhook.strip("${}"), slack_webhook)
+        webhook_value = _resolve_placeholder(slack_webhook, os.environ if env is None else env)
         if webhook_value.startswith("http"):
             try:
                 post_to_slack(webhook_value, message)
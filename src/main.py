@@ -8,11 +8,11 @@ Loads configuration, authenticates with TopstepX, and initializes the trading sy
 import logging
 import os
 import sys
-import json
+from collections import Counter
 from datetime import datetime, timezone
 
-import pandas as pd
-import yaml
+import numpy as np
+import orjson
 from dotenv import load_dotenv
 
 # Ensure project root (one level up from src/) is importable when running as a script
@@ -21,24 +21,39 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from execution.topstepx_client import TopstepXClient
-from data.gold_data import GoldDataPuller
 from monitoring.status_reporter import publish_status_report
+from src.utils import atomic_write_bytes, load_yaml
 
 # Load environment variables
 load_dotenv()
 
 # Load config
-with open('config/config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
+config = load_yaml('config/config.yaml')
 
 logging.basicConfig(level=logging.INFO)
 
+STATUS_PATH = 'config/status.json'
+# Pretty-printed like the previous json.dump(indent=2); numpy scalars from the data pulls serialize natively.
+_STATUS_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _read_status():
+    with open(STATUS_PATH, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def _write_status(status):
+    """Replace status.json in one step so the dashboard never reads a half-written file."""
+    atomic_write_bytes(STATUS_PATH, orjson.dumps(status, option=_STATUS_JSON_OPTIONS))
+
+
 def main():
     print("TopStepAi Starting...")
+    status = None
 
     # Initialize TopstepX client
     client = TopstepXClient()
-    if not client.authenticate():
+    if not client.ensure_authenticated():
         sys.exit(1)
 
     print("Authenticated with TopstepX.")
@@ -55,92 +70,107 @@ def main():
         # Get positions
         positions = client.get_positions(account_id)
         open_positions = positions.get('positions', []) if positions else []
-        open_risk = sum(abs(p.get('quantity', 0)) * p.get('entryPrice', 0) for p in open_positions)
+        count = len(open_positions)
+        quantities = np.fromiter((p.get('quantity', 0) for p in open_positions), dtype=np.float64, count=count)
+        entry_prices = np.fromiter((p.get('entryPrice', 0) for p in open_positions), dtype=np.float64, count=count)
+        open_risk = float(np.abs(quantities) @ entry_prices)
 
-        # Update status.json
-        with open('config/status.json', 'r') as f:
-            status = json.load(f)
+        # A contract can appear in several position rows; sum their sizes.
+        exposure_by_symbol = Counter()
+        for position in open_positions:
+            exposure_by_symbol[position.get('contractId', 'unknown')] += abs(position.get('quantity', 0))
 
+        # Update status.json
+        status = _read_status()
         status['equity'] = accounts[0]['balance']
         status['open_risk'] = open_risk
-        status['exposure_by_symbol'] = {p.get('contractId', 'unknown'): abs(p.get('quantity', 0)) for p in open_positions}
-
-        with open('config/status.json', 'w') as f:
-            json.dump(status, f, indent=2)
+        status['exposure_by_symbol'] = dict(exposure_by_symbol)
 
         print(f"Updated status: equity ${status['equity']}, open risk ${open_risk}")
 
-        # Pull gold data
-        gold_puller = GoldDataPuller(client)
-        if gold_puller.find_gold_contract():
-            timeframes = ["1min", "5min", "15min", "1hour", "1day"]
-            stitch_config = (config.get("data") or {}).get("stitch", {})
-            target_config = stitch_config.get("target_bars", {})
-            days_back = int(stitch_config.get("days_back", 240))
-            warn_threshold = float(stitch_config.get("warn_threshold", 0.9))
-
-            bars_per_timeframe = {tf: 20000 for tf in timeframes}
-            target_bars = {tf: int(target_config.get(tf, bars_per_timeframe.get(tf, 20000))) for tf in timeframes}
-
-            # Use live feed for official Topstep data; partial bar gives the current interval snapshot.
-            gold_puller.collect_candles(
-                timeframes=timeframes,
-                bars=bars_per_timeframe,
-                live=False,
-                include_partial_bar=True,
-                fallback_to_live=True,
-            )
-            for tf in timeframes:
-                gold_puller.save_candles(timeframe=tf)
-
-            stitched, contract_frames = gold_puller.collect_stitched_candles(
-                timeframes=timeframes,
-                bars_per_contract=20000,
-                include_partial_bar=True,
-                include_current=True,
-                min_year=20,
-                days_back=days_back,
-                target_bars=target_bars,
-            )
-
-            for tf in timeframes:
-                gold_puller.save_candles(timeframe=f"{tf}_chain")
-
-            contract_summary = {}
-            if contract_frames:
-                contract_summary = gold_puller.save_contract_candles(contract_frames)
-
-            timeframe_summary = {}
-            for tf, df in stitched.items():
-                if df is None or df.empty:
-                    continue
-                start = df["timestamp"].min()
-                end = df["timestamp"].max()
-                timeframe_summary[tf] = {
-                    "rows": int(len(df)),
-                    "start": start.to_pydatetime().isoformat() if pd.notna(start) else None,
-                    "end": end.to_pydatetime().isoformat() if pd.notna(end) else None,
+        # Written even if the gold pull raises, so the account update is never lost.
+        inventory_updated = False
+        try:
+            # Pull gold data; the puller and pandas are only imported on this path to keep CLI start-up light.
+            from data.gold_data import GoldDataPuller
+
+            gold_puller = GoldDataPuller(client)
+            inventory_updated = gold_puller.find_gold_contract()
+            if inventory_updated:
+                import pandas as pd
+
+                timeframes = ["1min", "5min", "15min", "1hour", "1day"]
+                stitch_config = (config.get("data") or {}).get("stitch", {})
+                target_config = stitch_config.get("target_bars", {})
+                days_back = int(stitch_config.get("days_back", 240))
+                warn_threshold = float(stitch_config.get("warn_threshold", 0.9))
+
+                bars_per_timeframe = {tf: 20000 for tf in timeframes}
+                target_bars = {tf: int(target_config.get(tf, bars_per_timeframe.get(tf, 20000))) for tf in timeframes}
+
+                # Use live feed for official Topstep data; partial bar gives the current interval snapshot.
+                gold_puller.collect_candles(
+                    timeframes=timeframes,
+                    bars=bars_per_timeframe,
+                    live=False,
+                    include_partial_bar=True,
+                    fallback_to_live=True,
+                )
+                for tf in timeframes:
+                    gold_puller.save_candles(timeframe=tf)
+
+                stitched, contract_frames = gold_puller.collect_stitched_candles(
+                    timeframes=timeframes,
+                    bars_per_contract=20000,
+                    include_partial_bar=True,
+                    include_current=True,
+                    min_year=20,
+                    days_back=days_back,
+                    target_bars=target_bars,
+                )
+
+                for tf in timeframes:
+                    gold_puller.save_candles(timeframe=f"{tf}_chain")
+
+                contract_summary = {}
+                if contract_frames:
+                    contract_summary = gold_puller.save_contract_candles(contract_frames)
+
+                timeframe_summary = {}
+                for tf, df in stitched.items():
+                    if df is None or df.empty:
+                        continue
+                    timestamps = df["timestamp"]
+                    # Stitched frames are sorted, so the bounds are the ends; NaT or disorder falls back to a scan.
+                    if timestamps.is_monotonic_increasing:
+                        start, end = timestamps.iloc[0], timestamps.iloc[-1]
+                    else:
+                        start, end = timestamps.min(), timestamps.max()
+                    timeframe_summary[tf] = {
+                        "rows": int(len(df)),
+                        "start": start.isoformat() if pd.notna(start) else None,
+                        "end": end.isoformat() if pd.notna(end) else None,
+                    }
+
+                status["data_inventory"] = {
+                    "as_of": datetime.now(timezone.utc).isoformat(),
+                    "days_back": days_back,
+                    "warn_threshold": warn_threshold,
+                    "timeframes": timeframe_summary,
+                    "contracts": contract_summary,
+                    "shortfalls": gold_puller.last_shortfall,
                 }
-
-            status["data_inventory"] = {
-                "as_of": datetime.now(timezone.utc).isoformat(),
-                "days_back": days_back,
-                "warn_threshold": warn_threshold,
-                "timeframes": timeframe_summary,
-                "contracts": contract_summary,
-                "shortfalls": gold_puller.last_shortfall,
-            }
-
-            with open('config/status.json', 'w') as f:
-                json.dump(status, f, indent=2)
-
+            else:
+                print("No MGC contract found")
+        finally:
+            # Single write once account and inventory updates are merged.
+            _write_status(status)
+        if inventory_updated:
             publish_status_report(status, config.get("monitoring", {}))
-        else:
-            print("No MGC contract found")
 
     # Load status
-    with open('config/status.json', 'r') as f:
-        status = json.load(f)
+    if status is None:
+        status = _read_status()
 
     print(f"Current equity: ${status['equity']}")
     print(f"Profit target: ${status['profit_target']}")
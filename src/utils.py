@@ -0,0 +1,58 @@
+"""Small file helpers shared by the CLI, monitoring jobs and the Streamlit GUI."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Union
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader
+
+# The process umask, read once at import: os.umask can only be read by setting it.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def load_yaml(path: Union[str, Path]) -> Any:
+    """Parse the YAML file at ``path`` with the libyaml-backed safe loader when available."""
+    with open(path, "r", encoding="utf-8") as handle:
+        return yaml.load(handle, Loader=SafeLoader)
+
+
+def file_mtime_ns(path: Path) -> int:
+    """Return ``path``'s modification time in nanoseconds, or 0 when it cannot be read."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes) -> None:
+    """Replace ``path`` with ``data`` in one step so readers never see a partial file.
+
+    The bytes are written and fsynced to a temp file in the same directory, then swapped
+    in with ``os.replace``. An existing file keeps its permissions; a new one gets
+    ``0o666 & ~umask`` like a plain ``open`` (``mkstemp`` alone would leave it 0600).
+    """
+    path = Path(path)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from monitoring import status_reporter
+
+
+@pytest.fixture
+def slack_capture(monkeypatch):
+    """Replace ``post_to_slack`` with a fake and return the dict it records into."""
+    captured = {}
+
+    def fake_post(url, message):
+        captured["url"] = url
+        captured["message"] = message
+
+    monkeypatch.setattr(status_reporter, "post_to_slack", fake_post)
+    return captured
@@ -0,0 +1,44 @@
+import os
+
+import pandas as pd
+
+from gui import charts
+
+
+def test_downsample_ohlc_keeps_each_bucket_extremes():
+    frame = pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2025-01-06", periods=10, freq="h"),
+            "open": [float(i) for i in range(10)],
+            "high": [5.0, 9.0, 6.0, 7.0, 1.0, 2.0, 8.0, 3.0, 4.0, 6.5],
+            "low": [0.5, -1.0, 0.0, 0.2, 0.3, -2.0, 0.1, 0.4, 0.6, -0.5],
+            "close": [10.0 + i for i in range(10)],
+        }
+    )
+
+    sampled = charts._downsample_ohlc(frame, target_points=3)  # buckets of 4, 4 and 2 candles
+
+    assert sampled["timestamp"].tolist() == frame["timestamp"].iloc[[0, 4, 8]].tolist()
+    assert sampled["open"].tolist() == [0.0, 4.0, 8.0]
+    assert sampled["high"].tolist() == [9.0, 8.0, 6.5]
+    assert sampled["low"].tolist() == [-1.0, -2.0, -0.5]
+    assert sampled["close"].tolist() == [13.0, 17.0, 19.0]
+
+
+def test_downsample_ohlc_returns_short_frames_unchanged():
+    frame = pd.DataFrame({"timestamp": [], "open": [], "high": [], "low": [], "close": []})
+
+    assert charts._downsample_ohlc(frame, target_points=3) is frame
+
+
+def test_load_candles_ignores_a_sidecar_from_another_csv(tmp_path):
+    path = tmp_path / "gold_candles_1hour.csv"
+    path.write_text("timestamp,open,high,low,close\n2025-01-06 00:00:00,1,2,0.5,1.5\n")
+    os.utime(path, ns=(2_000_000_000_000_000_000, 2_000_000_000_000_000_000))
+    assert charts._load_candles(str(path), path.stat().st_mtime_ns)["open"].tolist() == [1]
+    assert path.with_suffix(".parquet").exists()
+
+    # An older file restored over the CSV (cp -p, rsync, git checkout) is still picked up.
+    path.write_text("timestamp,open,high,low,close\n2025-01-06 00:00:00,3,4,2.5,3.5\n")
+    os.utime(path, ns=(1_000_000_000_000_000_000, 1_000_000_000_000_000_000))
+    assert charts._load_candles(str(path), path.stat().st_mtime_ns)["open"].tolist() == [3]
@@ -0,0 +1,85 @@
+import orjson
+import pytest
+
+from monitoring import inventory_validator
+
+STITCH_CONFIG = {"target_bars": {"1min": 100, "5min": 100}, "warn_threshold": 0.9}
+
+
+def make_status(contracts):
+    return {
+        "data_inventory": {
+            "timeframes": {"1min": {"rows": 100}, "5min": {"rows": 95}},
+            "contracts": {tf: {cid: {"rows": 10} for cid in ids} for tf, ids in contracts.items()},
+        }
+    }
+
+
+@pytest.fixture
+def history_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(inventory_validator, "HISTORY_PATH", tmp_path / "history.json")
+    monkeypatch.setattr(inventory_validator, "HISTORY_CONTRACTS_PATH", tmp_path / "history_contracts.parquet")
+    return tmp_path
+
+
+def test_reports_new_and_missing_contracts():
+    status = make_status({"1min": ["MGCZ25", "MGCG26"], "5min": ["MGCZ25"]})
+    baseline = {"timeframes": {"1min": 100, "5min": 95}, "contracts": [["1min", "MGCZ25"], ["5min", "MGCV25"]]}
+
+    issues = list(inventory_validator.validate_inventory(status, STITCH_CONFIG, baseline))
+
+    assert issues == ["New contracts detected: 1min:MGCG26, 5min:MGCZ25", "Contracts missing: 5min:MGCV25"]
+
+
+def test_empty_baseline_contract_list_reports_every_contract_as_new():
+    status = make_status({"1min": ["MGCZ25"]})
+    baseline = {"timeframes": {}, "contracts": []}
+
+    issues = list(inventory_validator.validate_inventory(status, STITCH_CONFIG, baseline))
+
+    assert issues == ["New contracts detected: 1min:MGCZ25"]
+
+
+def test_matching_baseline_and_targets_pass():
+    status = make_status({"1min": ["MGCZ25"]})
+    baseline = {"timeframes": {"1min": 100}, "contracts": [["1min", "MGCZ25"]]}
+
+    assert list(inventory_validator.validate_inventory(status, STITCH_CONFIG, baseline)) == []
+
+
+def test_history_round_trips_through_parquet(history_paths):
+    status = make_status({"1min": ["MGCZ25", "MGCG26"], "5min": ["MGCZ25"]})
+    assert inventory_validator.load_history() is None
+
+    inventory_validator.update_history(status)
+    baseline = inventory_validator.load_history()
+
+    assert baseline["timeframes"] == {"1min": 100, "5min": 95}
+    assert list(inventory_validator.validate_inventory(status, STITCH_CONFIG, baseline)) == []
+
+
+def test_snapshot_without_its_contracts_file_is_no_baseline(history_paths, caplog):
+    inventory_validator.update_history(make_status({"1min": ["MGCZ25"]}))
+    inventory_validator.HISTORY_CONTRACTS_PATH.unlink()
+
+    with caplog.at_level("WARNING", logger=inventory_validator.__name__):
+        assert inventory_validator.load_history() is None
+    assert any("no contracts file" in record.getMessage() for record in caplog.records)
+
+
+def test_inline_json_baseline_matches_parquet_baseline(history_paths):
+    status = make_status({"1min": ["MGCZ25"], "5min": ["MGCZ25"]})
+    changed = make_status({"1min": ["MGCG26"], "5min": ["MGCZ25"]})
+    inventory_validator.update_history(status)
+    parquet_baseline = inventory_validator.load_history()
+
+    # Snapshots written before the Parquet sidecar kept the contract pairs inline.
+    inventory_validator.HISTORY_CONTRACTS_PATH.unlink()
+    inventory_validator.HISTORY_PATH.write_bytes(
+        orjson.dumps({"timeframes": {"1min": 100, "5min": 95}, "contracts": [["1min", "MGCZ25"], ["5min", "MGCZ25"]]})
+    )
+    json_baseline = inventory_validator.load_history()
+
+    expected = ["New contracts detected: 1min:MGCG26", "Contracts missing: 1min:MGCZ25"]
+    assert list(inventory_validator.validate_inventory(changed, STITCH_CONFIG, parquet_baseline)) == expected
+    assert list(inventory_validator.validate_inventory(changed, STITCH_CONFIG, json_baseline)) == expected
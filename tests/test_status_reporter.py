@@ -1,11 +1,17 @@
 import logging
+import re
 
 import pytest
 
 from monitoring import status_reporter
 
+_EXPECTED_MESSAGE = re.compile(
+    r"TopStepAi Data Inventory.*?5min: 11849 rows.*?Shortfalls:.*?- 5min: 11849/12000", re.DOTALL
+)
+_NON_SHORTFALL = re.compile(r"- 1min:")
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def sample_status():
     return {
         "data_inventory": {
@@ -26,35 +32,27 @@ def sample_status():
 def test_format_status_message_includes_shortfalls(sample_status):
     message = status_reporter.format_status_message(sample_status)
 
-    assert "TopStepAi Data Inventory" in message
-    assert "5min: 11849 rows" in message
-    assert "Shortfalls:" in message
-    assert "- 5min: 11849/12000" in message
-    assert "- 1min:" not in message  # should not include non-shortfall entries
-
-
-def test_publish_status_report_skips_placeholder(sample_status, caplog):
-    caplog.set_level(logging.DEBUG, logger=status_reporter.logger.name)
-
-    status_reporter.publish_status_report(sample_status, {"alerts_slack_webhook": "${ALERTS_SLACK_WEBHOOK}"})
-
-    assert "Slack webhook placeholder detected; skipping post" in caplog.text
-
-
-def test_publish_status_report_posts_to_slack(sample_status, monkeypatch, caplog):
-    caplog.set_level(logging.INFO, logger=status_reporter.logger.name)
-
-    captured = {}
-
-    def fake_post(url, message):
-        captured["url"] = url
-        captured["message"] = message
-
-    monkeypatch.setenv("ALERTS_SLACK_WEBHOOK", "https://hooks.slack.test/abc123")
-    monkeypatch.setattr(status_reporter, "post_to_slack", fake_post)
-
-    status_reporter.publish_status_report(sample_status, {"alerts_slack_webhook": "${ALERTS_SLACK_WEBHOOK}"})
-
-    assert captured["url"] == "https://hooks.slack.test/abc123"
-    assert "Posted status summary to Slack" in caplog.text
-    assert captured["message"].startswith("TopStepAi Data Inventory")
+    assert _EXPECTED_MESSAGE.search(message)
+    assert not _NON_SHORTFALL.search(message)  # should not include non-shortfall entries
+
+
+@pytest.mark.parametrize(
+    "env, expected_log, posted",
+    [
+        ({}, "Slack webhook placeholder detected; skipping post", False),
+        ({"ALERTS_SLACK_WEBHOOK": "https://hooks.slack.test/abc123"}, "Posted status summary to Slack", True),
+    ],
+    ids=["placeholder", "resolved"],
+)
+def test_publish_status_report(sample_status, slack_capture, caplog, env, expected_log, posted):
+    with caplog.at_level(logging.DEBUG, logger=status_reporter.logger.name):
+        status_reporter.publish_status_report(
+            sample_status, {"alerts_slack_webhook": "${ALERTS_SLACK_WEBHOOK}"}, env=env
+        )
+
+    assert any(expected_log in r.getMessage() for r in caplog.records)
+    if posted:
+        assert slack_capture["url"] == "https://hooks.slack.test/abc123"
+        assert slack_capture["message"].startswith("TopStepAi Data Inventory")
+    else:
+        assert not slack_capture
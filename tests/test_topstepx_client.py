@@ -0,0 +1,565 @@
+import asyncio
+import io
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import orjson
+import pytest
+import requests
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import execution.topstepx_client as topstepx_client
+from execution.topstepx_client import BarCache, TokenBucket, TopstepXClient, UserStreamCache, _stream_json
+from src import utils
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self.content = orjson.dumps(data)
+        self.headers = {"Content-Length": str(len(self.content))}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+
+def make_client(tmp_path, bars, newest_first=False):
+    client = TopstepXClient()
+    client.bar_cache = BarCache(tmp_path)
+    client.calls = []
+
+    def fake_post(path, payload, timeout=30, stream=False):
+        client.calls.append(payload)
+        start = datetime.fromisoformat(payload["startTime"])
+        end = datetime.fromisoformat(payload["endTime"])
+        window = [bar for bar in bars if start <= datetime.fromisoformat(bar["t"]) <= end]
+        if newest_first:
+            window.reverse()
+        return FakeResponse({"success": True, "bars": window[: payload["limit"]]})
+
+    client._post = fake_post
+    return client
+
+
+def hourly_bars(start, hours):
+    return [
+        {"t": (start + timedelta(hours=i)).isoformat(), "o": 1.0, "h": 2.0, "l": 0.5, "c": 1.5, "v": 10.0}
+        for i in range(hours)
+    ]
+
+
+def test_retrieve_bars_serves_closed_days_from_cache(tmp_path):
+    day0 = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=4)
+    bars = hourly_bars(day0, 72)
+    client = make_client(tmp_path, bars)
+
+    first = client.retrieve_bars("CON.F.US.MGC.Z25", day0, day0 + timedelta(days=3), unit="hour", limit=500)
+    assert len(first["bars"]) == 72
+    assert len(client.calls) == 1
+    assert len(list(tmp_path.rglob("*.parquet"))) == 3
+    assert {path.stat().st_mode & 0o777 for path in tmp_path.rglob("*.parquet")} == {0o666 & ~utils._UMASK}
+
+    second = client.retrieve_bars(
+        "CON.F.US.MGC.Z25", day0 + timedelta(hours=6), day0 + timedelta(days=2), unit="hour", limit=500
+    )
+    assert len(client.calls) == 1  # fully served from disk
+    assert [bar["t"] for bar in second["bars"]] == [bar["t"] for bar in bars[6:49]]
+    assert "bars_array" not in second
+
+    array = client.retrieve_bars(
+        "CON.F.US.MGC.Z25", day0 + timedelta(hours=6), day0 + timedelta(days=2), unit="hour", limit=500, as_array=True
+    )
+    assert "bars" not in array  # the array replaces the list rather than sitting beside it
+    assert len(array["bars_array"]) == 43
+    assert array["bars_array"]["c"].dtype.kind == "f"
+
+
+def test_retrieve_bars_shape_does_not_depend_on_cache_state(tmp_path):
+    day0 = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=4)
+    bars = [dict(bar, o=2, v=7) for bar in hourly_bars(day0, 72)]
+    client = make_client(tmp_path, bars, newest_first=True)
+
+    window = ("CON.F.US.MGC.Z25", day0, day0 + timedelta(days=3))
+    miss = client.retrieve_bars(*window, unit="hour", limit=500)
+    hit = client.retrieve_bars(*window, unit="hour", limit=500)
+
+    assert len(list(tmp_path.rglob("*.parquet"))) == 3  # the second call is served from disk
+    assert miss["bars"] == hit["bars"]
+    assert miss["bars"][0]["t"] == bars[0]["t"]  # oldest first on both paths
+    assert type(hit["bars"][0]["v"]) is int and type(hit["bars"][0]["o"]) is float
+
+
+def test_retrieve_bars_skips_cache_for_truncated_responses(tmp_path):
+    day0 = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=3)
+    client = make_client(tmp_path, hourly_bars(day0, 72))
+
+    data = client.retrieve_bars("CON.F.US.MGC.Z25", day0, day0 + timedelta(days=3), unit="hour", limit=24)
+    assert len(data["bars"]) == 24
+    assert not list(tmp_path.rglob("*.parquet"))
+
+
+def test_retrieve_bars_skips_cache_when_the_gateway_cap_truncates(tmp_path, monkeypatch):
+    monkeypatch.setattr(topstepx_client, "_MAX_BARS", 48)
+    day0 = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=4)
+    client = make_client(tmp_path, hourly_bars(day0, 72))
+
+    client.retrieve_bars("CON.F.US.MGC.Z25", day0, day0 + timedelta(days=3), unit="hour", limit=500)
+    assert not list(tmp_path.rglob("*.parquet"))
+
+
+def test_retrieve_bars_caches_only_days_the_bars_reach(tmp_path):
+    day0 = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=6)
+    bars = hourly_bars(day0, 48)  # the feed stops after two of the five requested days
+    client = make_client(tmp_path, bars)
+    window = ("CON.F.US.MGC.Z25", day0, day0 + timedelta(days=5))
+
+    assert len(client.retrieve_bars(*window, unit="hour", limit=500)["bars"]) == 48
+    assert sorted(path.stem for path in tmp_path.rglob("*.parquet")) == [
+        (day0 + timedelta(days=i)).date().isoformat() for i in range(2)
+    ]
+
+    bars[:] = hourly_bars(day0, 120)  # the feed catches up
+    assert len(client.retrieve_bars(*window, unit="hour", limit=500)["bars"]) == 120
+    assert client.calls[-1]["startTime"] == (day0 + timedelta(days=2)).isoformat().replace("+00:00", "Z")
+
+
+def test_retrieve_bars_returns_a_failed_tail_without_cached_bars(tmp_path):
+    day0 = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=4)
+    client = make_client(tmp_path, hourly_bars(day0, 72))
+    window = ("CON.F.US.MGC.Z25", day0, day0 + timedelta(days=4))
+    assert len(client.retrieve_bars(*window, unit="hour", limit=500)["bars"]) == 72
+
+    failure = {"success": False, "errorCode": 1, "bars": []}
+    client._post = lambda path, payload, timeout=30, stream=False: FakeResponse(failure)
+
+    data = client.retrieve_bars(*window, unit="hour", limit=500)
+    assert data["success"] is False and data["errorCode"] == 1
+    assert data["bars"] == []  # the three cached days are not merged into the error
+
+
+@pytest.mark.parametrize("unit, unit_number", [("week", 1), ("month", 1), ("day", 2), ("hour", 5)])
+def test_retrieve_bars_never_caches_bars_that_outlive_their_day(tmp_path, unit, unit_number):
+    day0 = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=14)
+    bars = [{"t": day0.isoformat(), "o": 1.0, "h": 2.0, "l": 0.5, "c": 1.5, "v": 10}]
+    client = make_client(tmp_path, bars)
+    window = ("CON.F.US.MGC.Z25", day0, day0 + timedelta(days=14))
+
+    assert client.retrieve_bars(*window, unit=unit, unit_number=unit_number)["bars"][0]["h"] == 2.0
+    bars[0] = dict(bars[0], h=3.0)  # the still-open bar moves on the gateway
+    assert client.retrieve_bars(*window, unit=unit, unit_number=unit_number)["bars"][0]["h"] == 3.0
+    assert len(client.calls) == 2
+    assert not list(tmp_path.rglob("*.parquet"))
+
+
+def test_retrieve_bars_does_not_cache_empty_responses(tmp_path):
+    day0 = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=3)
+    bars = []
+    client = make_client(tmp_path, bars)
+    window = ("CON.F.US.MGC.Z25", day0, day0 + timedelta(days=3))
+
+    assert client.retrieve_bars(*window, unit="hour", limit=500)["bars"] == []
+    assert not list(tmp_path.rglob("*.parquet"))
+
+    bars.extend(hourly_bars(day0, 72))  # the feed catches up
+    assert len(client.retrieve_bars(*window, unit="hour", limit=500)["bars"]) == 72
+    assert len(client.calls) == 2
+
+
+def test_stream_json_matches_bulk_parse():
+    start = datetime(2025, 1, 6, tzinfo=timezone.utc)
+    body = {"bars": hourly_bars(start, 5), "success": True, "errorCode": 0, "errorMessage": None}
+    raw = orjson.dumps(body)
+
+    assert _stream_json(io.BytesIO(raw), "bars") == orjson.loads(raw)
+
+
+def test_stream_json_reports_malformed_bodies_as_value_error():
+    with pytest.raises(ValueError):
+        _stream_json(io.BytesIO(b'{"bars": [{"t": '), "bars")
+
+
+def test_contract_lookups_are_cached_until_refresh(tmp_path):
+    client = make_client(tmp_path, [])
+    calls = []
+
+    def fake_post(path, payload, timeout=30, stream=False):
+        calls.append(payload)
+        return FakeResponse({"success": True, "contract": {"id": payload["contractId"]}})
+
+    client._post = fake_post
+
+    assert client.get_contract_by_id("CON.F.US.MGC.Z25") == {"id": "CON.F.US.MGC.Z25"}
+    client.get_contract_by_id("CON.F.US.MGC.Z25")
+    assert len(calls) == 1
+
+    client.refresh()
+    client.get_contract_by_id("CON.F.US.MGC.Z25")
+    assert len(calls) == 2
+
+
+def test_failed_lookups_are_not_cached(tmp_path):
+    client = make_client(tmp_path, [])
+    replies = [{"success": False, "errorCode": 1}, {"success": True, "accounts": [{"id": 1}]}]
+    calls = []
+
+    def fake_post(path, payload, timeout=30, stream=False):
+        calls.append(path)
+        return FakeResponse(replies.pop(0) if len(replies) > 1 else replies[0])
+
+    client._post = fake_post
+
+    assert client.get_accounts()["success"] is False
+    assert client.get_accounts()["accounts"] == [{"id": 1}]
+    client.get_accounts()
+    assert len(calls) == 2
+
+
+def test_ensure_authenticated_reuses_session_until_ttl(tmp_path):
+    client = make_client(tmp_path, [])
+    logins = []
+
+    def fake_post(path, payload, timeout=30, stream=False):
+        logins.append(path)
+        return FakeResponse({"success": True, "token": f"token-{len(logins)}"})
+
+    client._post = fake_post
+
+    assert client.ensure_authenticated()
+    assert client.ensure_authenticated()
+    assert logins == ["/api/Auth/loginKey"]
+
+    client._session_expires_at = 0.0
+    assert client.ensure_authenticated()
+    assert client.token == "token-2"
+
+
+class CountingFuture(topstepx_client.Future):
+    """Future that counts callers blocked in ``result()``, so tests know every waiter arrived."""
+
+    waiting = 0
+    lock = threading.Lock()
+
+    def result(self, timeout=None):
+        with CountingFuture.lock:
+            CountingFuture.waiting += 1
+        return super().result(timeout)
+
+
+def run_coalesced(monkeypatch, client, fetch_result, callers=8):
+    """Call get_contract_by_id from ``callers`` threads while the owner's POST is held open."""
+    monkeypatch.setattr(topstepx_client, "Future", CountingFuture)
+    CountingFuture.waiting = 0
+    release = threading.Event()
+    posts = []
+
+    def fake_post(path, payload, timeout=30, stream=False):
+        posts.append(payload)
+        release.wait(5)
+        return fetch_result(payload)
+
+    client._post = fake_post
+    outcomes = [None] * callers
+
+    def call(i):
+        try:
+            outcomes[i] = client.get_contract_by_id("CON.F.US.MGC.Z25")
+        except Exception as exc:
+            outcomes[i] = exc
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while CountingFuture.waiting < callers - 1 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert CountingFuture.waiting == callers - 1  # every other caller is parked on the owner's future
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return posts, outcomes
+
+
+def test_concurrent_identical_calls_share_one_post(tmp_path, monkeypatch):
+    client = make_client(tmp_path, [])
+    posts, outcomes = run_coalesced(
+        monkeypatch, client, lambda payload: FakeResponse({"success": True, "contract": {"id": payload["contractId"]}})
+    )
+
+    assert len(posts) == 1
+    assert outcomes == [{"id": "CON.F.US.MGC.Z25"}] * 8
+    assert client._inflight == {}
+
+
+def test_coalesced_owner_failure_reaches_every_waiter(tmp_path, monkeypatch):
+    client = make_client(tmp_path, [])
+
+    def fail(payload):
+        raise requests.ConnectionError("gateway down")
+
+    posts, outcomes = run_coalesced(monkeypatch, client, fail)
+
+    assert len(posts) == 1
+    assert all(isinstance(outcome, requests.ConnectionError) for outcome in outcomes)
+    assert client._inflight == {}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_paces_after_burst_and_honours_penalty():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=4, capacity=2, clock=clock)
+
+    assert [bucket._reserve() for _ in range(3)] == [0.0, 0.0, 0.25]
+    clock.now += 0.25
+    assert bucket._reserve() == 0.25  # the refilled token was already promised to the third caller
+
+    clock.now += 1.0
+    bucket.penalize(2)
+    assert bucket._reserve() == 2.25
+    assert TokenBucket(rate=0, capacity=1, clock=clock)._reserve() == 0.0
+
+
+def test_order_and_read_buckets_share_one_rate_budget(monkeypatch):
+    monkeypatch.setenv("TOPSTEPX_RPS", "8")
+    client = TopstepXClient()
+    assert client._bucket.rate + client._order_bucket.rate == 8
+    assert 0 < client._order_bucket.rate < client._bucket.rate
+
+    clock = FakeClock()
+    client._bucket = TokenBucket(rate=client._bucket.rate, capacity=1, clock=clock)
+    client._order_bucket = TokenBucket(rate=client._order_bucket.rate, capacity=1, clock=clock)
+    client._bucket.penalize(60)
+    client.token, client._session_expires_at = "token", float("inf")
+    client.session.post = lambda url, **kwargs: FakeResponse({"success": True, "orderId": 1})
+
+    # A drained read bucket does not hold back orders.
+    assert client.place_order(1, "CON.F.US.MGC.Z25", side=0, size=1) == {"success": True, "orderId": 1}
+    assert client._bucket._reserve() > 60
+    assert client._order_bucket._reserve() == 0.5  # only the order bucket's token was spent
+
+    # A 429 on a read slows order traffic too.
+    client._bucket = TokenBucket(rate=client._bucket.rate, capacity=1, clock=clock)
+    throttled = FakeResponse({"success": False})
+    throttled.status_code, throttled.headers = 429, {"Retry-After": "30"}
+    client.session.post = lambda url, **kwargs: throttled
+    client.get_accounts()
+    assert client._order_bucket._reserve() > 30
+
+
+def test_user_stream_cache_tracks_positions_orders_and_trades():
+    cache = UserStreamCache(ttl=60)
+    cache.apply("positions", {"data": {"id": 1, "accountId": 7, "size": 1}})
+    assert cache.positions(7) is None  # not subscribed yet: events are ignored
+
+    cache.reset(7)
+    assert cache.positions(7) is None  # subscribed but not seeded
+    cache.seed_positions(7, [{"id": 1, "accountId": 7, "quantity": 2}, {"id": 2, "accountId": 7, "size": 1}])
+    cache.apply("positions", {"data": {"id": 2, "accountId": 7, "size": 0}})
+    cache.apply("positions", {"id": 3, "accountId": 7, "quantity": -1})
+    assert sorted(p["id"] for p in cache.positions(7)) == [1, 3]
+
+    since = cache._since[7]
+    created = (since + timedelta(seconds=5)).isoformat()
+    cache.apply("orders", {"data": {"id": 10, "accountId": 7, "creationTimestamp": created}})
+    cache.apply("trades", {"data": {"id": 20, "accountId": 7, "creationTimestamp": None}})
+    assert [o["id"] for o in cache.search("orders", 7, since + timedelta(seconds=1), None)] == [10]
+    assert [t["id"] for t in cache.search("trades", 7, since, None)] == [20]  # undated: kept from ``since``
+    assert cache.search("orders", 7, since - timedelta(hours=1), None) is None  # before the subscription
+    assert cache.search("orders", 7, since, since + timedelta(hours=1)) is None  # bounded windows go to REST
+
+    cache._seeded_at[7] -= 61
+    assert cache.positions(7) is None  # stale seed
+
+    cache.clear()
+    assert cache.search("orders", 7, since, None) is None
+
+
+def test_requests_log_in_on_first_use():
+    client = TopstepXClient()
+    urls = []
+
+    def fake_session_post(url, **kwargs):
+        urls.append(url.rsplit("/api", 1)[-1])
+        return FakeResponse({"success": True, "token": "token", "accounts": []})
+
+    client.session.post = fake_session_post
+
+    assert client.get_accounts()["accounts"] == []
+    client.cancel_order(5)
+    assert urls == ["/Auth/loginKey", "/Account/search", "/Order/cancel"]
+
+
+def test_requests_are_not_sent_when_the_login_fails():
+    client = TopstepXClient()
+    urls = []
+
+    def fake_session_post(url, **kwargs):
+        urls.append(url.rsplit("/api", 1)[-1])
+        return FakeResponse({"success": False, "message": "bad key"})
+
+    client.session.post = fake_session_post
+
+    assert client.get_accounts() is None
+    assert client.cancel_order(5) is False
+    assert client.search_orders(1, "2025-01-01T00:00:00Z") is None
+    assert client.search_trades(1, "2025-01-01T00:00:00Z") is None
+    assert urls == ["/Auth/loginKey"] * 4
+
+    client._atransport = httpx.MockTransport(lambda request: pytest.fail("sent without a token"))
+    client.base_url = "https://gateway.test"
+    assert asyncio.run(client.aget_positions(1)) is None
+    assert urls[-1] == "/Auth/loginKey"
+
+
+def test_prepared_requests_pick_up_the_token_from_a_relogin():
+    client = TopstepXClient()
+    client.base_url = "https://gateway.test"
+    logins, sent = [], []
+
+    def fake_session_post(url, **kwargs):
+        logins.append(url)
+        return FakeResponse({"success": True, "token": f"token-{len(logins)}"})
+
+    def fake_send(request, **kwargs):
+        sent.append((request.url, request.headers["Authorization"], orjson.loads(request.body)))
+        return FakeResponse({"success": True, "orders": []})
+
+    client.session.post = fake_session_post
+    client.session.send = fake_send
+
+    client.search_orders(1, "2025-01-01T00:00:00Z")
+    assert "/api/Order/search" in client._prepared
+    client._session_expires_at = 0.0  # session TTL elapsed
+    client.search_orders(2, "2025-01-01T00:00:00Z")
+
+    assert len(logins) == 2
+    assert [auth for _, auth, _ in sent] == ["Bearer token-1", "Bearer token-2"]
+    assert [body["accountId"] for _, _, body in sent] == [1, 2]
+    assert all(url == "https://gateway.test/api/Order/search" for url, _, _ in sent)
+
+
+def make_async_client(tmp_path, handler):
+    """Client whose async calls go to ``handler`` through an ``httpx.MockTransport``."""
+    client = TopstepXClient()
+    client.bar_cache = BarCache(tmp_path)
+    client.token, client._session_expires_at = "token", float("inf")
+    client._bucket = TokenBucket(rate=0, capacity=1)
+    client.base_url = "https://gateway.test"
+    client._atransport = httpx.MockTransport(handler)
+    return client
+
+
+@pytest.mark.parametrize(
+    "path, key, method",
+    [("/api/Order/search", "orders", "aiter_all_orders"), ("/api/Trade/search", "trades", "aiter_all_trades")],
+)
+def test_async_window_search_keeps_window_order_and_dedupes_edges(tmp_path, path, key, method):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    windows = []
+
+    async def handler(request):
+        assert request.url.path == path
+        payload = orjson.loads(request.content)
+        lower = datetime.fromisoformat(payload["startTimestamp"].replace("Z", "+00:00"))
+        windows.append((payload["startTimestamp"], payload["endTimestamp"]))
+        index = (lower - start).days // 7
+        await asyncio.sleep(0.01 * (3 - index))  # later windows answer first
+        # Each window also returns the record sitting on its lower edge, which the previous one has too.
+        records = [{"id": f"edge-{index}"}, {"id": f"mid-{index}"}, {"id": f"edge-{index + 1}"}]
+        return httpx.Response(200, content=orjson.dumps({"success": True, key: records}))
+
+    client = make_async_client(tmp_path, handler)
+
+    async def collect():
+        return [record["id"] async for record in getattr(client, method)(1, start, start + timedelta(days=20))]
+
+    ids = asyncio.run(collect())
+
+    assert sorted(windows) == [
+        ("2025-01-01T00:00:00Z", "2025-01-08T00:00:00Z"),
+        ("2025-01-08T00:00:00Z", "2025-01-15T00:00:00Z"),
+        ("2025-01-15T00:00:00Z", "2025-01-21T00:00:00Z"),
+    ]
+    assert ids == ["edge-0", "mid-0", "edge-1", "mid-1", "edge-2", "mid-2", "edge-3"]
+
+
+def test_async_window_search_rejects_non_positive_windows(tmp_path):
+    client = make_async_client(tmp_path, lambda request: httpx.Response(500))
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    async def collect():
+        records = client.aiter_all_orders(1, start, start + timedelta(days=1), window=timedelta(0))
+        return [record async for record in records]
+
+    with pytest.raises(ValueError):
+        asyncio.run(collect())
+
+
+def test_batch_retrieve_bars_fans_out_and_keeps_spec_order(tmp_path):
+    day0 = datetime(2025, 1, 6, tzinfo=timezone.utc)
+    seen = []
+
+    async def handler(request):
+        payload = orjson.loads(request.content)
+        seen.append(payload["contractId"])
+        await asyncio.sleep(0.02 if payload["contractId"] == "A" else 0)
+        bars = [dict(bar, c=1.0 if payload["contractId"] == "A" else 2.0) for bar in hourly_bars(day0, 3)]
+        return httpx.Response(200, content=orjson.dumps({"success": True, "bars": bars}))
+
+    client = make_async_client(tmp_path, handler)
+    specs = [
+        {"contract_id": contract, "start_time": day0, "end_time": day0 + timedelta(hours=2), "unit": "hour"}
+        for contract in ("A", "B")
+    ]
+
+    first, second = client.batch_retrieve_bars(specs)
+
+    assert sorted(seen) == ["A", "B"]
+    assert [bar["c"] for bar in first["bars"]] == [1.0] * 3 and [bar["c"] for bar in second["bars"]] == [2.0] * 3
+    assert "bars_array" not in first
+    assert client.aclient is None  # closed with the event loop that owned it
+
+
+def test_async_429_penalizes_both_buckets(tmp_path):
+    client = make_async_client(
+        tmp_path, lambda request: httpx.Response(429, headers={"Retry-After": "30"}, content=b"{}")
+    )
+    clock = FakeClock()
+    client._bucket = TokenBucket(rate=1, capacity=1, clock=clock)
+    client._order_bucket = TokenBucket(rate=1, capacity=1, clock=clock)
+
+    day0 = datetime(2025, 1, 6, tzinfo=timezone.utc)
+    assert asyncio.run(client.aretrieve_bars("A", day0, day0 + timedelta(hours=2), unit="hour")) is None
+    assert client._bucket._reserve() > 30
+    assert client._order_bucket._reserve() > 30
+
+
+def test_async_calls_survive_a_new_event_loop(tmp_path):
+    client = make_async_client(
+        tmp_path, lambda request: httpx.Response(200, content=orjson.dumps({"success": True, "positions": []}))
+    )
+
+    assert asyncio.run(client.aget_positions(1))["positions"] == []
+    first = client.aclient
+    assert asyncio.run(client.aget_positions(1))["positions"] == []  # the first loop is closed by now
+    assert client.aclient is not first
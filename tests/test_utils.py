@@ -0,0 +1,24 @@
+import os
+
+from src import utils
+
+
+def test_atomic_write_bytes_creates_files_with_the_umask_mode(tmp_path):
+    path = tmp_path / "status.json"
+
+    utils.atomic_write_bytes(path, b"{}")
+
+    assert path.read_bytes() == b"{}"
+    assert path.stat().st_mode & 0o777 == 0o666 & ~utils._UMASK
+    assert os.listdir(tmp_path) == ["status.json"]
+
+
+def test_atomic_write_bytes_keeps_an_existing_files_mode(tmp_path):
+    path = tmp_path / "status.json"
+    path.write_bytes(b"old")
+    path.chmod(0o640)
+
+    utils.atomic_write_bytes(path, b"new")
+
+    assert path.read_bytes() == b"new"
+    assert path.stat().st_mode & 0o777 == 0o640